@@ -0,0 +1,209 @@
+# batch_extract.py
+"""
+Offline hand landmark extraction over recorded videos, for building traces
+and evaluation sets. Videos are cut into chunks of --chunk-seconds which
+a pool of worker processes works through, each with its own MediaPipe
+Hands instance and no drawing.
+
+    python batch_extract.py recordings/*.mp4 --out traces/
+    python batch_extract.py long.mp4@600-1800 --out traces/ --jobs 8 --merge
+
+VIDEO@START-END limits a video to a time range in seconds. Outputs are
+keyed by the video's name plus a hash of its absolute path, so videos with
+the same name in different directories don't collide. Every chunk is saved
+as <out>/<key>/<key>.<first>-<end>.npz in the save_trace format, with
+timestamps in seconds from the start of the video and the parameters it
+was extracted with. Files are written under a temporary name and renamed
+when complete, and existing chunks with matching parameters are skipped,
+so an interrupted run resumes where it stopped. --merge joins the chunks
+planned for each video into <out>/<key>.npz afterwards.
+
+Frames are mirrored first, as in the live app, so handedness matches.
+Every chunk gets a fresh Hands instance, so its result doesn't depend on
+which chunks the worker processed before it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from gesture_recognizer import select_hand
+from hand_backends import SolutionsHandBackend
+from landmark_utils import landmarks_to_array, load_trace, save_trace
+from pipeline import mp_context
+
+# Set per worker process by _init_worker
+_scale = 1.0
+
+
+def parse_video_spec(spec):
+    """"path" or "path@START-END" (seconds) -> (path, start, end or None)"""
+    path, _, time_range = spec.partition("@")
+    if not time_range:
+        return path, 0.0, None
+    start, _, end = time_range.partition("-")
+    return path, float(start or 0), float(end) if end else None
+
+
+def video_key(path):
+    """Output name for a video: its stem plus a hash of the absolute path"""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    return f"{stem}-{digest}"
+
+
+def chunk_params(chunk, scale):
+    """What a chunk file was extracted from, stored in it to check on resume"""
+    path, chunk_start, chunk_end, fps, _ = chunk
+    return json.dumps({'video': os.path.abspath(path), 'start': chunk_start, 'end': chunk_end,
+                       'fps': fps, 'scale': scale}, sort_keys=True)
+
+
+def chunk_is_done(chunk, scale):
+    """True if the chunk file exists and was extracted with the same parameters"""
+    out_path = chunk[4]
+    if not os.path.exists(out_path):
+        return False
+    try:
+        with np.load(out_path) as data:
+            stored = str(data['chunk'])
+    except (OSError, ValueError, KeyError):
+        stored = None
+    if stored != chunk_params(chunk, scale):
+        print(f"Re-extracting {out_path}: written with different parameters")
+        return False
+    return True
+
+
+def plan_chunks(specs, out_dir, chunk_seconds):
+    """Split videos into (video, first_frame, end_frame, fps, out_path) chunks"""
+    chunks = []
+    planned = set()
+    for spec in specs:
+        path, start, end = parse_video_spec(spec)
+        cap = cv2.VideoCapture(path)
+        if not cap.isOpened():
+            print(f"Skipping {path}: could not open")
+            continue
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        first = int(round(start * fps))
+        last = frame_count if end is None else min(frame_count, int(round(end * fps)))
+        chunk_frames = max(1, int(round(chunk_seconds * fps)))
+        key = video_key(path)
+        for chunk_start in range(first, last, chunk_frames):
+            chunk_end = min(chunk_start + chunk_frames, last)
+            out_path = os.path.join(out_dir, key, f"{key}.{chunk_start:08d}-{chunk_end:08d}.npz")
+            # The same video and range given twice is one chunk
+            if out_path not in planned:
+                planned.add(out_path)
+                chunks.append((path, chunk_start, chunk_end, fps, out_path))
+    return chunks
+
+
+def _init_worker(scale):
+    global _scale
+    # The pool provides the parallelism; keep OpenCV from oversubscribing cores
+    cv2.setNumThreads(1)
+    _scale = scale
+
+
+def extract_chunk(chunk):
+    """Run detection over one chunk and save it. Returns (out_path, frames, seconds)."""
+    path, chunk_start, chunk_end, fps, out_path = chunk
+    start_time = time.perf_counter()
+    detector = SolutionsHandBackend()
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, chunk_start)
+    timestamps, landmarks, hand_types = [], [], []
+    for index in range(chunk_start, chunk_end):
+        success, frame = cap.read()
+        if not success:
+            break
+        frame = cv2.flip(frame, 1)
+        if _scale != 1.0:
+            frame = cv2.resize(frame, None, fx=_scale, fy=_scale, interpolation=cv2.INTER_AREA)
+        hands, _ = detector.detect(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        hand_landmarks, hand_type = select_hand(hands)
+        timestamps.append(index / fps)
+        landmarks.append(landmarks_to_array(hand_landmarks) if hand_landmarks else None)
+        hand_types.append(hand_type)
+    cap.release()
+    detector.close()
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = out_path + ".part"
+    with open(tmp_path, "wb") as f:
+        save_trace(f, timestamps, landmarks, hand_types, chunk=np.array(chunk_params(chunk, _scale)))
+    os.replace(tmp_path, out_path)
+    return out_path, len(timestamps), time.perf_counter() - start_time
+
+
+def merge_chunks(out_dir, key, chunks):
+    """
+    Concatenate the given chunks of one video, in frame order, into
+    <out_dir>/<key>.npz. Raises ValueError if their ranges overlap.
+    """
+    chunks = sorted(chunks, key=lambda c: c[1])
+    for previous, chunk in zip(chunks, chunks[1:]):
+        if chunk[1] < previous[2]:
+            raise ValueError(f"overlapping chunks {os.path.basename(previous[4])} and {os.path.basename(chunk[4])}")
+    traces = [load_trace(c[4]) for c in chunks]
+    if not traces:
+        return None
+    merged_path = os.path.join(out_dir, f"{key}.npz")
+    np.savez_compressed(merged_path, **{key: np.concatenate([t[key] for t in traces])
+                                       for key in ('timestamps', 'landmarks', 'hand_types')})
+    return merged_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract hand landmarks from recorded videos in parallel")
+    parser.add_argument("videos", nargs="+", help="Video files, optionally PATH@START-END in seconds")
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--chunk-seconds", type=float, default=60.0, help="Length of one work unit")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Worker processes")
+    parser.add_argument("--scale", type=float, default=1.0, help="Downscale frames before detection")
+    parser.add_argument("--merge", action="store_true", help="Join each video's chunks into one trace")
+    args = parser.parse_args()
+
+    chunks = plan_chunks(args.videos, args.out, args.chunk_seconds)
+    todo = [c for c in chunks if not chunk_is_done(c, args.scale)]
+    print(f"{len(chunks)} chunks, {len(chunks) - len(todo)} already done, {len(todo)} to extract on {args.jobs} workers")
+
+    start = time.perf_counter()
+    total_frames = 0
+    if todo:
+        with mp_context.Pool(args.jobs, initializer=_init_worker, initargs=(args.scale,)) as pool:
+            for done, (out_path, frames, seconds) in enumerate(pool.imap_unordered(extract_chunk, todo), 1):
+                total_frames += frames
+                elapsed = time.perf_counter() - start
+                print(f"[{done}/{len(todo)}] {os.path.basename(out_path)}: {frames} frames in {seconds:.1f}s "
+                      f"| total {total_frames / elapsed:.1f} frames/s")
+
+    elapsed = time.perf_counter() - start
+    if total_frames:
+        print(f"Extracted {total_frames} frames in {elapsed:.1f}s ({total_frames / elapsed:.1f} frames/s)")
+
+    if args.merge:
+        by_video = {}
+        for chunk in chunks:
+            by_video.setdefault(video_key(chunk[0]), []).append(chunk)
+        for key, video_chunks in sorted(by_video.items()):
+            try:
+                merged = merge_chunks(args.out, key, video_chunks)
+            except (ValueError, OSError) as e:
+                print(f"Not merging {key}: {e}")
+                continue
+            if merged:
+                print(f"Merged trace: {merged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# benchmarks/fixtures.py
+"""
+Landmark fixtures for the benchmarks: synthetic hand poses built from a
+simple 2D skeleton, and recorded traces saved by replay_harness.py
+(--save-trace).
+
+traces/scripted_session.npz is a committed trace in the same format: a
+scripted ten second session at 30 FPS with moving, rotating hands,
+gradual pose transitions and frames without a hand. Regenerate it with
+
+    python benchmarks/fixtures.py
+"""
+import os
+import sys
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from landmark_utils import array_to_landmarks, load_trace, save_trace
+
+TRACE_DIR = os.path.join(BENCH_DIR, "traces")
+SCRIPTED_TRACE = os.path.join(TRACE_DIR, "scripted_session.npz")
+
+WRIST = (0.5, 0.8)
+FINGER_MCPS = {
+    'index': (0.45, 0.60),
+    'middle': (0.50, 0.58),
+    'ring': (0.55, 0.60),
+    'pinky': (0.60, 0.63),
+}
+FINGER_INDICES = {'index': 5, 'middle': 9, 'ring': 13, 'pinky': 17}
+
+# Expected gesture -> extended fingers (right hand)
+POSES = {
+    'OPEN': ('thumb', 'index', 'middle', 'ring', 'pinky'),
+    'CLOSE': (),
+    'POINTING': ('index',),
+    'SCROLL': ('index', 'middle'),
+    'PINCH': None,  # Special case: thumb and index tips touching
+}
+
+
+def make_hand(extended=(), pinch=False):
+    """Build a (21, 3) landmark array for a right hand in the given pose"""
+    points = np.zeros((21, 3), dtype=np.float32)
+    points[0, :2] = WRIST
+
+    # Thumb: CMC, MCP, IP, TIP
+    if 'thumb' in extended:
+        points[1:5, :2] = [(0.43, 0.75), (0.38, 0.70), (0.34, 0.66), (0.30, 0.62)]
+    else:
+        points[1:5, :2] = [(0.43, 0.75), (0.41, 0.71), (0.45, 0.69), (0.50, 0.69)]
+
+    for finger, mcp in FINGER_MCPS.items():
+        i = FINGER_INDICES[finger]
+        x, y = mcp
+        if finger in extended:
+            points[i:i + 4, :2] = [(x, y), (x, y - 0.05), (x, y - 0.085), (x, y - 0.115)]
+        else:
+            points[i:i + 4, :2] = [(x, y), (x, y - 0.04), (x + 0.005, y - 0.01), (x, y + 0.01)]
+
+    if pinch:
+        points[1:5, :2] = [(0.43, 0.75), (0.40, 0.69), (0.38, 0.64), (0.37, 0.60)]
+        points[5:9, :2] = [(0.45, 0.60), (0.42, 0.55), (0.40, 0.56), (0.385, 0.58)]
+    return points
+
+
+def synthetic_fixtures(count=100, jitter=0.002, seed=0):
+    """
+    Returns a list of (landmarks, hand_type, expected_gesture) cycling over
+    all poses, each with small random jitter so no two frames are identical.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(POSES)
+    fixtures = []
+    for i in range(count):
+        gesture = names[i % len(names)]
+        base = make_hand(pinch=True) if POSES[gesture] is None else make_hand(POSES[gesture])
+        noisy = base + rng.normal(0, jitter, base.shape).astype(np.float32)
+        fixtures.append((array_to_landmarks(noisy), "Right", gesture))
+    return fixtures
+
+
+def _pose(gesture):
+    return make_hand(pinch=True) if POSES[gesture] is None else make_hand(POSES[gesture])
+
+
+def scripted_trace(seconds=10, fps=30, seed=0):
+    """
+    (timestamps, landmarks, hand_types) of a scripted session: one pose per
+    second, blended into the next over TRANSITION frames, while the hand
+    drifts, rotates and changes size. Every fourth pose is followed by a
+    short gap without a hand, and one stretch uses the left hand.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(POSES)
+    transition, gap = 6, 8
+    timestamps, landmarks, hand_types = [], [], []
+    for i in range(int(seconds * fps)):
+        t = i / fps
+        timestamps.append(t)
+        second, frame = divmod(i, fps)
+        if second % 4 == 3 and frame >= fps - gap:
+            landmarks.append(None)
+            hand_types.append(None)
+            continue
+        points = _pose(names[second % len(names)])
+        if frame >= fps - transition:
+            blend = (frame - (fps - transition) + 1) / (transition + 1)
+            points = (1 - blend) * points + blend * _pose(names[(second + 1) % len(names)])
+
+        # Rotate and scale around the wrist, then move the whole hand
+        angle = 0.15 * np.sin(0.7 * t)
+        scale = 1.0 + 0.1 * np.sin(0.4 * t)
+        rotation = np.array([[np.cos(angle), -np.sin(angle)], [np.sin(angle), np.cos(angle)]])
+        wrist = points[0, :2].copy()
+        points = points.copy()
+        points[:, :2] = (points[:, :2] - wrist) @ rotation.T * scale + wrist
+        points[:, :2] += (0.12 * np.sin(0.5 * t), 0.06 * np.sin(0.8 * t))
+        points[:, 2] = -0.02 * np.linspace(0, 1, len(points))
+        points += rng.normal(0, 0.002, points.shape)
+
+        hand_type = "Left" if 6 <= second < 8 else "Right"
+        if hand_type == "Left":
+            points[:, 0] = 1.0 - points[:, 0]
+        landmarks.append(points.astype(np.float32))
+        hand_types.append(hand_type)
+    return timestamps, landmarks, hand_types
+
+
+def trace_fixtures(path):
+    """Returns (landmarks, hand_type, None) for every frame with a hand in a trace"""
+    trace = load_trace(path)
+    fixtures = []
+    for points, hand_type in zip(trace['landmarks'], trace['hand_types']):
+        if not np.isnan(points).any():
+            fixtures.append((array_to_landmarks(points), str(hand_type), None))
+    return fixtures
+
+
+if __name__ == "__main__":
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    save_trace(SCRIPTED_TRACE, *scripted_trace())
+    print(f"Trace written to {SCRIPTED_TRACE}")
@@ -0,0 +1,204 @@
+# benchmarks/hot_paths.py
+"""
+Micro-benchmarks for the per-frame hot paths: smoothing_utils,
+GestureRecognizer gesture classification and ui_utils drawing. Runs
+headless (no camera, no display) and compares against baseline.json.
+
+    python benchmarks/hot_paths.py                    # compare to baseline
+    python benchmarks/hot_paths.py --trace rec.npz    # add a recorded trace
+    python benchmarks/hot_paths.py --update-baseline  # record new baseline
+
+The recognizer cases also run on the committed trace in benchmarks/traces
+(see fixtures.py), so the baseline covers more than the synthetic poses.
+
+Each case is also timed relative to a fixed pure-Python calibration loop
+measured right before it. --runs N measures every case N times and keeps
+the run with the median score, for noisy machines. Baselines compare these relative scores, which
+cancels most of the difference between machines and CPU frequency states.
+Exits with status 1 if any score is worse than its baseline times the
+regression threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import deque
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import numpy as np
+
+import config
+import smoothing_utils as su
+import ui_utils as ui
+from gesture_recognizer import GestureRecognizer
+from fixtures import SCRIPTED_TRACE, synthetic_fixtures, trace_fixtures
+
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_THRESHOLD = 1.5  # Fail when more than 50% slower than baseline
+DEFAULT_TRACES = [SCRIPTED_TRACE]  # Always benchmarked, on top of --trace
+
+
+def measure(func, calls, repeats=7):
+    """Best-of-repeats time per call in microseconds, after one warm-up run"""
+    func(calls)
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(calls)
+        best = min(best, time.perf_counter() - start)
+    return 1e6 * best / calls
+
+
+def calibration_loop(n):
+    x = 0.0
+    for i in range(n):
+        x = (x * 1.000001 + i) % 1e6
+    return x
+
+
+def measure_relative(func, calls, repeats=7):
+    """Returns (us per call, score relative to the calibration loop)"""
+    reference = measure(calibration_loop, 20000, repeats)
+    value = measure(func, calls, repeats)
+    return value, value / reference
+
+
+def build_cases(fixtures):
+    """Return {case_name: (func(n), calls)} for the hot paths"""
+    rng = np.random.default_rng(1)
+    positions = rng.uniform(0, 1920, 1000).tolist()
+    recognizer = GestureRecognizer(with_detector=False)
+
+    def moving_average(n):
+        buffer = deque(maxlen=config.position_buffer_size)
+        for i in range(n):
+            su.moving_average_filter(buffer, positions[i % 1000])
+
+    def kalman(n):
+        estimate, error = 0.0, 1.0
+        for i in range(n):
+            estimate, error = su.kalman_filter(estimate, error, positions[i % 1000],
+                                               config.kalman_measurement_variance, config.kalman_process_variance)
+
+    def velocity_limit(n):
+        for i in range(n):
+            su.apply_velocity_limit(positions[i % 1000], positions[(i + 1) % 1000],
+                                    positions[(i + 2) % 1000], positions[(i + 3) % 1000], config.MAX_VELOCITY)
+
+    def deadzone(n):
+        for i in range(n):
+            su.apply_deadzone(positions[i % 1000], positions[(i + 1) % 1000],
+                              positions[(i + 2) % 1000], positions[(i + 3) % 1000], config.DEADZONE_PIXELS)
+
+    def get_gesture(n):
+        for i in range(n):
+            recognizer.landmarks, recognizer.active_hand_type, _ = fixtures[i % len(fixtures)]
+            recognizer.get_gesture()
+
+    def finger_states(n):
+        for i in range(n):
+            recognizer.landmarks, recognizer.active_hand_type, _ = fixtures[i % len(fixtures)]
+            recognizer._get_finger_states()
+
+    frame = np.zeros((config.CAPTURE_HEIGHT, config.CAPTURE_WIDTH, 3), dtype=np.uint8)
+    ui_state = {
+        'fps': 30.0, 'current_gesture': "POINTING", 'confidence': 0.9,
+        'is_dragging': False, 'is_scrolling': False, 'is_pointer_locked': False,
+        'x_min_bound': 256, 'y_min_bound': 144, 'x_max_bound': 1024, 'y_max_bound': 576,
+        'active_area_color': (255, 255, 0), 'close_gesture_count': 0, 'last_close_gesture_time': 0,
+        'pointer_coords': (640, 360), 'velocity': 12.0, 'is_ppt_mode': False
+    }
+
+    def draw_ui(n):
+        for _ in range(n):
+            ui.draw_ui_elements(frame, ui_state)
+
+    return {
+        'smoothing.moving_average_filter': (moving_average, 20000),
+        'smoothing.kalman_filter': (kalman, 20000),
+        'smoothing.apply_velocity_limit': (velocity_limit, 20000),
+        'smoothing.apply_deadzone': (deadzone, 20000),
+        'recognizer.get_gesture': (get_gesture, 2000),
+        'recognizer._get_finger_states': (finger_states, 2000),
+        'ui.draw_ui_elements': (draw_ui, 200),
+    }
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {'threshold': DEFAULT_THRESHOLD, 'results': {}, 'scores': {}}
+    with open(BASELINE_PATH) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot path micro-benchmarks")
+    parser.add_argument("--trace", action="append", default=[],
+                        help="Recorded landmark trace (.npz) to benchmark the recognizer on")
+    parser.add_argument("--update-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=None, help="Override the regression threshold")
+    parser.add_argument("--repeats", type=int, default=7)
+    parser.add_argument("--runs", type=int, default=1, help="Measure each case this often and keep the median")
+    args = parser.parse_args()
+
+    fixture_sets = {'synthetic': synthetic_fixtures()}
+    for path in DEFAULT_TRACES + args.trace:
+        fixtures = trace_fixtures(path)
+        if fixtures:
+            fixture_sets[os.path.basename(path)] = fixtures
+        else:
+            print(f"Skipping {path}: no frames with a hand")
+
+    results = {}
+    for fixture_name, fixtures in fixture_sets.items():
+        for name, (func, calls) in build_cases(fixtures).items():
+            # Only the recognizer cases depend on the fixtures
+            if fixture_name != 'synthetic':
+                if not name.startswith("recognizer."):
+                    continue
+                name = f"{name}[{fixture_name}]"
+            runs = sorted((measure_relative(func, calls, args.repeats) for _ in range(args.runs)),
+                          key=lambda run: run[1])
+            results[name] = runs[len(runs) // 2]
+
+    baseline = load_baseline()
+    threshold = args.threshold or baseline.get('threshold', DEFAULT_THRESHOLD)
+    regressions = []
+    print(f"{'case':<52} | {'us/call':>9} | {'score':>9} | {'baseline':>9} | {'ratio':>6}")
+    for name, (value, score) in results.items():
+        base = baseline.get('scores', {}).get(name)
+        if base:
+            ratio = score / base
+            flag = "  REGRESSION" if ratio > threshold else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<52} | {value:>9.2f} | {score:>9.2f} | {base:>9.2f} | {ratio:>5.2f}x{flag}")
+        else:
+            print(f"{name:<52} | {value:>9.2f} | {score:>9.2f} | {'-':>9} | {'-':>6}")
+
+    if args.update_baseline:
+        baseline = {
+            'threshold': args.threshold or DEFAULT_THRESHOLD,
+            'machine': f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+            'units': "results: microseconds per call (best of repeats); scores: relative to the calibration loop",
+            'results': {name: round(value, 3) for name, (value, _) in results.items()},
+            'scores': {name: round(score, 3) for name, (_, score) in results.items()},
+        }
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {BASELINE_PATH}")
+        return 0
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {threshold:.2f}x baseline: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,8 @@ import pygetwindow
 import platform
 import time
 
+from metrics import metrics
+
 class ComputerController:
     def __init__(self):
         self.screen_width, self.screen_height = pyautogui.size()
@@ -45,80 +47,104 @@ class ComputerController:
             else:
                 # Faster pyautogui call
                 pyautogui.moveTo(x, y, _pause=False)
+            metrics.inc("actions_total", action="point_movement")
         except Exception as e:
             print(f"Mouse movement error: {e}")
+            metrics.inc("controller_errors_total", action="point_movement")
     
     def left_click(self):
         """Perform left click"""
         try:
             pyautogui.click(_pause=False)
+            metrics.inc("actions_total", action="left_click")
         except Exception as e:
             print(f"Left click error: {e}")
+            metrics.inc("controller_errors_total", action="left_click")
     
     def right_click(self):
         """Perform right click"""
         try:
             pyautogui.rightClick(_pause=False)
+            metrics.inc("actions_total", action="right_click")
         except Exception as e:
             print(f"Right click error: {e}")
+            metrics.inc("controller_errors_total", action="right_click")
     
     def double_right_click(self):
         """Perform double right click"""
         try:
             pyautogui.rightClick(_pause=False)
             pyautogui.rightClick(_pause=False)
+            metrics.inc("actions_total", action="double_right_click")
         except Exception as e:
             print(f"Double right click error: {e}")
+            metrics.inc("controller_errors_total", action="double_right_click")
     
     def double_left_click(self):
         """Perform double left click"""
         try:
             pyautogui.doubleClick(_pause=False)
+            metrics.inc("actions_total", action="double_left_click")
         except Exception as e:
             print(f"Double left click error: {e}")
+            metrics.inc("controller_errors_total", action="double_left_click")
     
     def scroll(self, amount):
         """
-        Scroll the mouse wheel.
+        Scroll the mouse wheel. Sink for ScrollEngine.
         Positive amount = scroll up
         Negative amount = scroll down
+        Units are pyautogui's: wheel delta on Windows (120 = one notch),
+        whole wheel clicks/lines on Linux and macOS.
         """
         try:
             pyautogui.scroll(amount, _pause=False)
+            metrics.inc("actions_total", action="scroll")
         except Exception as e:
             print(f"Scroll error: {e}")
+            metrics.inc("controller_errors_total", action="scroll")
     
     def right_slide(self):
         try:
             pyautogui.press("right", _pause=False)
+            metrics.inc("actions_total", action="right_slide")
         except Exception as e:
             print(f"Error performing right button {e}")    
+            metrics.inc("controller_errors_total", action="right_slide")
 
     def left_slide(self):
         try:
             pyautogui.press("left", _pause=False)
+            metrics.inc("actions_total", action="left_slide")
         except Exception as e:
             print(f"Error performing right button {e}")    
+            metrics.inc("controller_errors_total", action="left_slide")
 
     def start_slide(self):
         try:
             pyautogui.press("f5", _pause=False)
+            metrics.inc("actions_total", action="start_slide")
         except Exception as e:
             print(f"Error performing right button {e}")    
+            metrics.inc("controller_errors_total", action="start_slide")
 
     def close_slide(self):
         try:
             pyautogui.press("escape", _pause=False)
+            metrics.inc("actions_total", action="close_slide")
         except Exception as e:
             print(f"Error performing right button {e}")    
+            metrics.inc("controller_errors_total", action="close_slide")
 
 
     def colaps(self):
         """Closing program"""
         try:
             pyautogui.hotkey('alt', 'f4', _pause=False)
+            metrics.inc("actions_total", action="colaps")
         except Exception as e:
             print(f"Error closing program {e}")    
+            metrics.inc("controller_errors_total", action="colaps")
 
     def start_drag(self):
         """Start dragging (mouse down)"""
@@ -126,8 +152,10 @@ class ComputerController:
             if not self.is_dragging:
                 pyautogui.mouseDown(_pause=False)
                 self.is_dragging = True
+                metrics.inc("actions_total", action="start_drag")
         except Exception as e:
             print(f"Start drag error: {e}")
+            metrics.inc("controller_errors_total", action="start_drag")
     
     def end_drag(self):
         """End dragging (mouse up)"""
@@ -135,8 +163,10 @@ class ComputerController:
             if self.is_dragging:
                 pyautogui.mouseUp(_pause=False)
                 self.is_dragging = False
+                metrics.inc("actions_total", action="end_drag")
         except Exception as e:
             print(f"End drag error: {e}")
+            metrics.inc("controller_errors_total", action="end_drag")
     
     def check_for_manual_failsafe(self):
         """
@@ -167,6 +197,7 @@ class ComputerController:
             
         except Exception as e:
             print(f"Failsafe check error: {e}")
+            metrics.inc("controller_errors_total", action="failsafe_check")
             return False
     
     def get_cursor_position(self):
@@ -20,13 +20,80 @@ use_adaptive_smoothing = True
 velocity_threshold_for_adaptive = 20  # pixels/frame
 
 # --- Other Settings ---
+GESTURE_BUFFER_SIZE = 5  # Frames voted over before a gesture becomes stable
+GESTURE_STABILITY_THRESHOLD = 0.6  # Fraction of the buffer that must agree
 CLICK_COOLDOWN = 0.3
 DOUBLE_CLICK_WINDOW = 0.6
 SINGLE_CLICK_DELAY = 0.7
 
 SCROLL_SENSITIVITY = 550
 SCROLL_DEADZONE = 0.01
+SCROLL_RATE_HZ = 120  # Scroll events per second while the scroll engine has something to send
+SCROLL_SMOOTHING = 0.05  # Seconds over which each frame's scroll movement is spread
+use_scroll_momentum = True  # Keep scrolling after the gesture ends, slowing down
+SCROLL_MOMENTUM_DECAY = 0.35  # Seconds for momentum to fall to ~37%
+SCROLL_MOMENTUM_MIN_SPEED = 60  # Scroll units/second below which momentum stops
 
 FRAME_REDUCTION = 0.2
 
 SWIPE_THRESHOLD = 0.15
+
+# --- Adaptive Rate (Idle Mode) ---
+IDLE_AFTER_FRAMES = 30  # Frames without a hand before dropping to idle rate
+IDLE_CHECK_FPS = 5  # Presence checks per second while idle
+IDLE_DETECTION_SCALE = 0.5  # Downscale factor for idle presence detection
+IDLE_UI_DELAY_MS = 100  # Main loop wait per iteration while idle
+use_motion_gate = True  # Only run detection while idle if the frame changed
+MOTION_GATE_SIZE = (64, 36)  # Tiny grayscale size used for frame differencing
+MOTION_THRESHOLD = 4.0  # Mean absolute pixel difference counted as motion
+MOTION_FORCED_CHECK_INTERVAL = 2.0  # Seconds between detections even without motion
+CPU_REPORT_INTERVAL = 30.0  # Seconds between CPU usage reports (0 disables)
+
+# --- Hand Detection ---
+HAND_BACKEND = "solutions"  # "solutions" (blocking mp.solutions.hands) or "tasks" (async HandLandmarker, LIVE_STREAM)
+HAND_LANDMARKER_MODEL = "models/hand_landmarker.task"  # Model file for the "tasks" backend
+
+# --- Keyframe Tracking ---
+use_keyframe_tracking = False  # Track landmarks with optical flow between detections
+KEYFRAME_INTERVAL = 3  # Run full hand detection every k frames
+TRACKING_SCALE = 0.5  # Downscale factor of the grayscale tracking image
+TRACKING_WIN_SIZE = 15  # Lucas-Kanade search window (pixels)
+TRACKING_PYRAMID_LEVELS = 2  # Extra pyramid levels for larger motions
+TRACKING_FB_MAX_ERROR = 1.5  # Max forward-backward error (pixels) for a good point
+TRACKING_MIN_GOOD_FRACTION = 0.8  # Re-detect when fewer points pass the check
+
+# --- Metrics ---
+METRICS_HTTP_PORT = 9108  # Local Prometheus endpoint at /metrics (None disables)
+METRICS_HTTP_HOST = "127.0.0.1"
+METRICS_JSON_PATH = None  # e.g. "metrics.json" to also write periodic snapshots
+METRICS_JSON_INTERVAL = 10.0  # Seconds between JSON snapshots
+
+# --- Capture Source ---
+CAPTURE_SOURCE = 1  # Camera index, "camera:N", "file:PATH", "dir:PATH" or "synthetic"
+CAPTURE_WIDTH = 1280
+CAPTURE_HEIGHT = 720
+CAPTURE_FPS = 30
+CAPTURE_FOURCC = "MJPG"  # Requested camera pixel format ("" keeps the driver default)
+CAPTURE_BUFFER_SIZE = 1
+CAPTURE_MAX_DRAIN = 4  # Max stale frames dropped per grab when buffering can't be disabled
+
+# --- Pipeline ---
+# Where each stage runs: "thread", "process" (own process; shares no state with the others),
+# "inline" (fused into the previous stage's worker) or "main" (the UI loop; keep render here)
+# mailbox = max items waiting in front of the stage
+PIPELINE_STAGES = {
+    'capture': {'placement': 'thread', 'mailbox': 2},
+    'detect': {'placement': 'thread', 'mailbox': 2},
+    'classify': {'placement': 'inline', 'mailbox': 2},
+    'filter': {'placement': 'inline', 'mailbox': 2},
+    'act': {'placement': 'thread', 'mailbox': 2},
+    'render': {'placement': 'main', 'mailbox': 2},
+}
+PIPELINE_DROP_POLICY = "drop_new"  # Full mailbox: "drop_new", "drop_oldest" or "block"
+PIPELINE_STATS_INTERVAL = 30.0  # Seconds between stage stat printouts
+
+# --- Profiling ---
+PROFILER_KEY = 'p'  # Key in the UI window that starts/stops the sampling profiler (SIGUSR1 does too)
+PROFILER_INTERVAL = 0.005  # Seconds between stack samples
+PROFILER_OUTPUT_DIR = "profiles"  # Where collapsed-stack (.folded) files are written
+THREAD_CPU_LOG_INTERVAL = 30.0  # Seconds between per-thread CPU reports
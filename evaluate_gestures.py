@@ -0,0 +1,255 @@
+# evaluate_gestures.py
+"""
+Replays labeled landmark traces through GestureRecognizer and
+GestureActionHandler and measures how long each gesture takes to be
+recognized (time-to-detect) and to fire its action (time-to-action), plus
+how often something fires that was never gestured (false triggers).
+
+Traces are .npz files from replay_harness.py --save-trace. Labels live next
+to each trace as <trace>.labels.json:
+
+    {"intervals": [{"gesture": "OPEN", "start": 1.20, "end": 1.90},
+                   {"gesture": "CLOSE", "start": 3.00, "end": 3.40, "action": "double_left_click"}]}
+
+    python evaluate_gestures.py traces/*.npz
+    python evaluate_gestures.py traces/*.npz --sweep GESTURE_BUFFER_SIZE=3,5,7 CLICK_COOLDOWN=0.2,0.3
+"""
+import argparse
+import ast
+import itertools
+import json
+import os
+
+import numpy as np
+
+import config
+from frame_result import FrameResult
+from gesture_actions import GestureActionHandler, RecordingController
+from gesture_recognizer import GestureRecognizer
+from landmark_utils import array_to_landmarks, load_trace
+from pipeline import mp_context
+
+# Action expected for a labeled gesture unless the label names one
+DEFAULT_ACTIONS = {
+    'OPEN': 'left_click',
+    'CLOSE': 'right_click',
+    'PINCH': 'start_drag',
+    'SCROLL': 'scroll',
+    'COLAPS': 'colaps',
+    'POINTING': 'point_movement',
+}
+# One-shot actions; continuous ones (cursor moves, scroll steps) are never false triggers
+DISCRETE_ACTIONS = {
+    'left_click', 'right_click', 'double_left_click', 'double_right_click', 'start_drag',
+    'colaps', 'start_slide', 'close_slide', 'left_slide', 'right_slide',
+}
+# Not counted as false detections: no gesture, and the continuous pointer/drag
+# modes the hand passes through between gestures
+IGNORED_GESTURES = {'IDLE', 'UNKNOWN', 'POINTING', 'PINCH'}
+
+
+def labels_path_for(trace_path):
+    return os.path.splitext(trace_path)[0] + ".labels.json"
+
+
+def replay_trace(trace, frame_shape=None):
+    """
+    Run a trace through a fresh recognizer and handler. Returns the stable
+    gesture transitions [(time, gesture)] and actions [(time, action)].
+    """
+    frame_shape = frame_shape or (config.CAPTURE_HEIGHT, config.CAPTURE_WIDTH, 3)
+    recognizer = GestureRecognizer(keyframe_interval=1, with_detector=False)
+    controller = RecordingController()
+    handler = GestureActionHandler(controller, verbose=False)
+
+    transitions = []
+    last_gesture = None
+    for timestamp, points, hand_type in zip(trace['timestamps'], trace['landmarks'], trace['hand_types']):
+        has_hand = not np.isnan(points).any()
+        recognizer.landmarks = array_to_landmarks(points) if has_hand else None
+        recognizer.active_hand_type = str(hand_type) if has_hand else None
+        gesture, confidence = recognizer.get_gesture()
+        pointer_coords = None
+        if has_hand:
+            pointer_coords, _, _ = recognizer.get_pointer_coordinates(frame_shape, gesture)
+
+        if gesture != last_gesture:
+            transitions.append((float(timestamp), gesture))
+            last_gesture = gesture
+
+        result = FrameResult.from_recognizer(None, recognizer.landmarks, recognizer.active_hand_type,
+                                             gesture, confidence, pointer_coords, timestamp, timestamp)
+        controller.current_time = float(timestamp)
+        handler.process(result, float(timestamp), frame_shape)
+
+    actions = [(t, name) for t, name, _ in controller.actions]
+    return transitions, actions
+
+
+def score_trace(intervals, transitions, actions, grace):
+    """
+    Match labeled intervals to detections and actions. Returns per-interval
+    records plus the false detections/actions that matched no interval.
+    """
+    records = []
+    used_actions = set()
+    for interval in intervals:
+        gesture = interval['gesture']
+        expected = interval.get('action', DEFAULT_ACTIONS.get(gesture))
+        start, end = interval['start'], interval['end'] + grace
+
+        # The gesture counts as detected if it is (or becomes) stable inside the window
+        detect_time = None
+        active = None
+        for t, g in transitions:
+            if t <= start:
+                active = g
+            elif t <= end and g == gesture:
+                detect_time = t
+                break
+        if active == gesture:
+            detect_time = start
+
+        action_time = None
+        for i, (t, name) in enumerate(actions):
+            if i not in used_actions and name == expected and start <= t <= end:
+                action_time = t
+                used_actions.add(i)
+                break
+
+        records.append({
+            'gesture': gesture,
+            'action': expected,
+            'time_to_detect': None if detect_time is None else detect_time - start,
+            'time_to_action': None if action_time is None else action_time - start,
+        })
+
+    def covered(t, gesture):
+        return any(iv['gesture'] == gesture and iv['start'] - grace <= t <= iv['end'] + grace for iv in intervals)
+
+    false_detections = [(t, g) for t, g in transitions if g not in IGNORED_GESTURES and not covered(t, g)]
+    false_actions = [(t, name) for i, (t, name) in enumerate(actions)
+                     if name in DISCRETE_ACTIONS and i not in used_actions]
+    return records, false_detections, false_actions
+
+
+def evaluate(trace_paths, grace=1.0, overrides=None):
+    """Evaluate all traces with optional config overrides. Returns a summary dict."""
+    for name, value in (overrides or {}).items():
+        setattr(config, name, value)
+
+    records, false_detections, false_actions = [], 0, 0
+    duration = 0.0
+    for path in trace_paths:
+        trace = load_trace(path)
+        with open(labels_path_for(path)) as f:
+            intervals = json.load(f)['intervals']
+        transitions, actions = replay_trace(trace)
+        trace_records, trace_false_detections, trace_false_actions = score_trace(intervals, transitions, actions, grace)
+        records.extend(trace_records)
+        false_detections += len(trace_false_detections)
+        false_actions += len(trace_false_actions)
+        if len(trace['timestamps']):
+            duration += float(trace['timestamps'][-1] - trace['timestamps'][0])
+
+    per_gesture = {}
+    for gesture in sorted({r['gesture'] for r in records}):
+        rows = [r for r in records if r['gesture'] == gesture]
+        ttd = [r['time_to_detect'] for r in rows if r['time_to_detect'] is not None]
+        tta = [r['time_to_action'] for r in rows if r['time_to_action'] is not None]
+        per_gesture[gesture] = {
+            'count': len(rows),
+            'detected': len(ttd) / len(rows),
+            'acted': len(tta) / len(rows),
+            'ttd_median': float(np.median(ttd)) if ttd else None,
+            'ttd_p90': float(np.percentile(ttd, 90)) if ttd else None,
+            'tta_median': float(np.median(tta)) if tta else None,
+            'tta_p90': float(np.percentile(tta, 90)) if tta else None,
+        }
+
+    all_tta = [r['time_to_action'] for r in records if r['time_to_action'] is not None]
+    minutes = max(duration / 60.0, 1e-9)
+    return {
+        'overrides': overrides or {},
+        'per_gesture': per_gesture,
+        'recall': sum(r['time_to_action'] is not None for r in records) / max(len(records), 1),
+        'tta_mean': float(np.mean(all_tta)) if all_tta else None,
+        'false_detections_per_min': false_detections / minutes,
+        'false_actions_per_min': false_actions / minutes,
+    }
+
+
+def _evaluate_settings(job):
+    trace_paths, grace, overrides = job
+    return evaluate(trace_paths, grace, overrides)
+
+
+def parse_sweep(specs):
+    """["NAME=1,2", ...] -> list of override dicts (cartesian product)"""
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        if not hasattr(config, name):
+            raise ValueError(f"Unknown config setting: {name}")
+        axes.append([(name, ast.literal_eval(v)) for v in values.split(",")])
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+def _fmt(value, unit="s"):
+    return "-" if value is None else f"{value:.3f}{unit}"
+
+
+def print_summary(summary):
+    print(f"{'gesture':<10} | {'n':>4} | {'detected':>8} | {'TTD med':>8} | {'TTD p90':>8} | "
+          f"{'acted':>6} | {'TTA med':>8} | {'TTA p90':>8}")
+    for gesture, stats in summary['per_gesture'].items():
+        print(f"{gesture:<10} | {stats['count']:>4} | {100 * stats['detected']:>7.0f}% | "
+              f"{_fmt(stats['ttd_median']):>8} | {_fmt(stats['ttd_p90']):>8} | {100 * stats['acted']:>5.0f}% | "
+              f"{_fmt(stats['tta_median']):>8} | {_fmt(stats['tta_p90']):>8}")
+    print(f"False detections: {summary['false_detections_per_min']:.2f}/min | "
+          f"False actions: {summary['false_actions_per_min']:.2f}/min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gesture time-to-detect / time-to-action evaluation")
+    parser.add_argument("traces", nargs="+", help="Trace files (.npz) with matching .labels.json")
+    parser.add_argument("--grace", type=float, default=1.0,
+                        help="Seconds after an interval ends in which its detection/action still counts")
+    parser.add_argument("--sweep", nargs="+", metavar="NAME=V1,V2",
+                        help="Config settings to sweep, e.g. CLICK_COOLDOWN=0.2,0.3")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Parallel workers for the sweep")
+    parser.add_argument("--max-false-rate", type=float, default=None,
+                        help="Max false actions/min for a setting to count as safe (default: current config)")
+    args = parser.parse_args()
+
+    baseline = evaluate(args.traces, args.grace)
+    print("=== Current config ===")
+    print_summary(baseline)
+    if not args.sweep:
+        return
+
+    combos = parse_sweep(args.sweep)
+    print(f"\nSweeping {len(combos)} settings on {args.jobs} workers...")
+    with mp_context.Pool(args.jobs) as pool:
+        summaries = pool.map(_evaluate_settings, [(args.traces, args.grace, combo) for combo in combos])
+
+    max_false = baseline['false_actions_per_min'] if args.max_false_rate is None else args.max_false_rate
+    safe = [s for s in summaries
+            if s['false_actions_per_min'] <= max_false and s['recall'] >= baseline['recall'] and s['tta_mean'] is not None]
+    safe.sort(key=lambda s: s['tta_mean'])
+
+    print(f"\n{'settings':<50} | {'TTA mean':>8} | {'recall':>6} | {'false/min':>9}")
+    for s in sorted(summaries, key=lambda s: (s['tta_mean'] is None, s['tta_mean'] or 0)):
+        marker = " *" if s in safe else ""
+        settings = ", ".join(f"{k}={v}" for k, v in s['overrides'].items())
+        print(f"{settings:<50} | {_fmt(s['tta_mean']):>8} | {100 * s['recall']:>5.0f}% | "
+              f"{s['false_actions_per_min']:>9.2f}{marker}")
+    if safe:
+        best = ", ".join(f"{k}={v}" for k, v in safe[0]['overrides'].items())
+        print(f"\nFastest safe setting (* = no more false actions and no lower recall than current): {best}")
+    else:
+        print("\nNo swept setting is as safe as the current config.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# frame_result.py
+from collections import namedtuple
+
+from landmark_utils import landmarks_to_array
+
+_FrameResultBase = namedtuple('FrameResult', [
+    'frame',            # Mirrored BGR frame with landmarks drawn (owned by the consumer)
+    'landmarks',        # Read-only (21, 3) float32 array of normalized landmarks, or None
+    'hand_type',        # "Left", "Right" or None
+    'gesture',          # Stable gesture name
+    'confidence',       # Confidence of the raw gesture on this frame
+    'pointer_coords',   # (x, y) pointer position in frame pixels, or None
+    'capture_time',     # time.time() when the frame was captured
+    'processed_time',   # time.time() when the gesture stage finished
+    'cursor',           # Smoothed (x, y) screen position from the filter stage, or None
+], defaults=(None,))
+
+
+class FrameResult(_FrameResultBase):
+    """
+    Immutable per-frame output of the gesture stage. Built once by the
+    gesture thread, then only read downstream, so nothing downstream has to
+    call back into the shared GestureRecognizer.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_recognizer(cls, frame, landmarks, hand_type, gesture, confidence,
+                        pointer_coords, capture_time, processed_time):
+        """Build a result, converting MediaPipe landmarks to a frozen array"""
+        array = None
+        if landmarks is not None:
+            array = landmarks_to_array(landmarks)
+            array.flags.writeable = False
+        return cls(frame, array, hand_type, gesture, confidence,
+                   pointer_coords, capture_time, processed_time)
+
+    @property
+    def has_hand(self):
+        return self.landmarks is not None
+
+    @property
+    def latency(self):
+        """Seconds from capture to the end of gesture processing"""
+        return self.processed_time - self.capture_time
@@ -0,0 +1,289 @@
+# frame_sources.py
+import os
+import platform
+import time
+from collections import deque
+import cv2
+import numpy as np
+
+import config
+
+
+class FrameSource:
+    """
+    Common interface for everything that produces frames. Mirrors the
+    grab()/retrieve()/read() split of cv2.VideoCapture so the camera thread
+    can drain cheaply and only decode the frames it actually uses.
+    """
+
+    name = "source"
+    live = False  # Live sources retry failed grabs; for others a failed grab ends the stream
+
+    def __init__(self):
+        self.grab_times = deque(maxlen=60)
+
+    def is_opened(self):
+        raise NotImplementedError
+
+    def grab(self):
+        """Advance to the next frame without decoding it. Returns success."""
+        raise NotImplementedError
+
+    def retrieve(self):
+        """Decode the last grabbed frame. Returns (success, frame)."""
+        raise NotImplementedError
+
+    def read(self):
+        if not self.grab():
+            return False, None
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+    def _mark_frame(self):
+        self.grab_times.append(time.perf_counter())
+
+    @property
+    def endless(self):
+        """True if reading never runs out of frames (live or looping)"""
+        return self.live or getattr(self, "loop", False)
+
+    @property
+    def achieved_fps(self):
+        """Frame rate measured over the most recent grabs"""
+        if len(self.grab_times) < 2:
+            return 0.0
+        span = self.grab_times[-1] - self.grab_times[0]
+        return (len(self.grab_times) - 1) / span if span > 0 else 0.0
+
+
+def _fourcc_to_str(value):
+    value = int(value)
+    return "".join(chr((value >> (8 * i)) & 0xFF) for i in range(4))
+
+
+class V4L2CameraSource(FrameSource):
+    """
+    Live camera. On Linux the V4L2 backend is used and MJPEG is requested
+    before the resolution, since most UVC cameras only reach 30 FPS at 720p
+    in MJPEG (raw YUYV is bandwidth limited). The negotiated format is read
+    back and reported. When the driver ignores CAP_PROP_BUFFERSIZE, grab()
+    drains stale buffered frames by grabbing until a grab actually waits.
+    """
+
+    live = True
+
+    def __init__(self, index=0, width=None, height=None, fps=None, fourcc=None, buffer_size=None):
+        super().__init__()
+        self.name = f"camera:{index}"
+        self.requested = (width or config.CAPTURE_WIDTH, height or config.CAPTURE_HEIGHT,
+                          fps or config.CAPTURE_FPS)
+        fourcc = config.CAPTURE_FOURCC if fourcc is None else fourcc
+        buffer_size = buffer_size or config.CAPTURE_BUFFER_SIZE
+
+        backend = cv2.CAP_V4L2 if platform.system() == "Linux" else cv2.CAP_ANY
+        self.cap = cv2.VideoCapture(index, backend)
+        self.drain = False
+        if not self.cap.isOpened():
+            return
+
+        # FOURCC has to be set before the frame size on V4L2
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.requested[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.requested[1])
+        self.cap.set(cv2.CAP_PROP_FPS, self.requested[2])
+        buffer_ok = self.cap.set(cv2.CAP_PROP_BUFFERSIZE, buffer_size)
+
+        self.negotiated = {
+            'fourcc': _fourcc_to_str(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            'width': int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'fps': self.cap.get(cv2.CAP_PROP_FPS),
+        }
+        self.frame_interval = 1.0 / (self.negotiated['fps'] or self.requested[2])
+        self.drain = not buffer_ok or int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE)) != buffer_size
+
+        print(f"✓ Camera {index}: {self.negotiated['width']}x{self.negotiated['height']} "
+              f"@ {self.negotiated['fps']:.0f} FPS ({self.negotiated['fourcc']})")
+        if (self.negotiated['width'], self.negotiated['height']) != self.requested[:2]:
+            print(f"  ⚠ Requested {self.requested[0]}x{self.requested[1]}")
+        if fourcc and self.negotiated['fourcc'] != fourcc:
+            print(f"  ⚠ Requested {fourcc}, camera may be limited to a lower frame rate")
+        if self.drain:
+            print("  ⚠ Buffer size not supported, draining stale frames on grab")
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def grab(self):
+        start = time.perf_counter()
+        if not self.cap.grab():
+            return False
+        if self.drain:
+            # A grab that returns much faster than a frame interval came from
+            # the driver queue, so it is stale: keep grabbing until one waits.
+            for _ in range(config.CAPTURE_MAX_DRAIN):
+                if time.perf_counter() - start > self.frame_interval * 0.5:
+                    break
+                start = time.perf_counter()
+                if not self.cap.grab():
+                    return False
+        self._mark_frame()
+        return True
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video. With realtime=True frames are paced at the file FPS."""
+
+    def __init__(self, path, loop=False, realtime=False):
+        super().__init__()
+        self.name = f"file:{path}"
+        self.path = path
+        self.loop = loop
+        self.realtime = realtime
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.next_frame_time = 0
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def grab(self):
+        if self.realtime:
+            delay = self.next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_frame_time = max(self.next_frame_time, time.perf_counter()) + 1.0 / self.fps
+        success = self.cap.grab()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success = self.cap.grab()
+        if success:
+            self._mark_frame()
+        return success
+
+    def retrieve(self):
+        return self.cap.retrieve()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Sorted still images from a directory, decoded on retrieve()"""
+
+    EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+    def __init__(self, path, fps=30.0, loop=False, realtime=False):
+        super().__init__()
+        self.name = f"dir:{path}"
+        self.files = sorted(os.path.join(path, f) for f in os.listdir(path)
+                            if f.lower().endswith(self.EXTENSIONS)) if os.path.isdir(path) else []
+        self.fps = fps
+        self.loop = loop
+        self.realtime = realtime
+        self.index = -1
+        self.next_frame_time = 0
+
+    def is_opened(self):
+        return bool(self.files)
+
+    def grab(self):
+        if self.realtime:
+            delay = self.next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_frame_time = max(self.next_frame_time, time.perf_counter()) + 1.0 / self.fps
+        self.index += 1
+        if self.index >= len(self.files):
+            if not self.loop or not self.files:
+                return False
+            self.index = 0
+        self._mark_frame()
+        return True
+
+    def retrieve(self):
+        frame = cv2.imread(self.files[self.index])
+        return frame is not None, frame
+
+
+class SyntheticSource(FrameSource):
+    """
+    Generated frames (a moving disc over a gradient) for benchmarks and
+    headless runs. Frame content depends only on the frame index.
+    """
+
+    def __init__(self, width=None, height=None, fps=None, num_frames=None, realtime=False):
+        super().__init__()
+        self.name = "synthetic"
+        self.width = width or config.CAPTURE_WIDTH
+        self.height = height or config.CAPTURE_HEIGHT
+        self.fps = fps or config.CAPTURE_FPS
+        self.num_frames = num_frames
+        self.realtime = realtime
+        self.index = -1
+        self.next_frame_time = 0
+        gradient = np.linspace(0, 255, self.width, dtype=np.uint8)
+        self.background = np.repeat(np.tile(gradient, (self.height, 1))[:, :, None], 3, axis=2)
+
+    def is_opened(self):
+        return True
+
+    @property
+    def endless(self):
+        return self.num_frames is None
+
+    def grab(self):
+        if self.num_frames is not None and self.index + 1 >= self.num_frames:
+            return False
+        if self.realtime:
+            delay = self.next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_frame_time = max(self.next_frame_time, time.perf_counter()) + 1.0 / self.fps
+        self.index += 1
+        self._mark_frame()
+        return True
+
+    def retrieve(self):
+        frame = self.background.copy()
+        phase = self.index / self.fps
+        center = (int(self.width * (0.5 + 0.3 * np.sin(phase))), int(self.height * (0.5 + 0.3 * np.cos(phase))))
+        cv2.circle(frame, center, self.height // 10, (60, 180, 255), -1)
+        return True, frame
+
+
+def create_frame_source(spec, realtime=False):
+    """
+    Build a source from a spec: an int or "camera:N" for a live camera,
+    "synthetic" or "synthetic:WxH", "dir:PATH" / an existing directory, and
+    "file:PATH" / any other path for a video file.
+    """
+    if isinstance(spec, int):
+        return V4L2CameraSource(spec)
+    spec = str(spec)
+    kind, _, value = spec.partition(":")
+    if spec.isdigit():
+        return V4L2CameraSource(int(spec))
+    if kind == "camera":
+        return V4L2CameraSource(int(value or 0))
+    if kind == "synthetic":
+        if value:
+            width, height = (int(v) for v in value.lower().split("x"))
+            return SyntheticSource(width, height, realtime=realtime)
+        return SyntheticSource(realtime=realtime)
+    if kind == "dir":
+        return ImageDirectorySource(value, realtime=realtime)
+    if kind == "file":
+        return VideoFileSource(value, realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime)
+    return VideoFileSource(spec, realtime=realtime)
@@ -0,0 +1,244 @@
+# gesture_actions.py
+import math
+from collections import Counter, deque
+
+import numpy as np
+
+import config
+import smoothing_utils as su
+from metrics import metrics
+from scroll_engine import ScrollEngine
+
+
+def map_to_screen(pointer_coords, frame_shape, screen_width, screen_height):
+    """Map frame pixel coordinates inside the active area to screen pixels"""
+    x_min_bound, y_min_bound, x_max_bound, y_max_bound = GestureActionHandler.active_area(frame_shape)
+    raw_x, raw_y = pointer_coords
+    screen_x = np.interp(raw_x, (x_min_bound, x_max_bound), (0, screen_width))
+    screen_y = np.interp(raw_y, (y_min_bound, y_max_bound), (0, screen_height))
+    return screen_x, screen_y
+
+
+class GestureActionHandler:
+    """
+    Turns the stream of FrameResults into mouse/keyboard actions. Owns all
+    interaction state (lock, drag, scroll, swipe, click timing, PPT mode) so
+    the same logic runs live from main.py and offline from recorded traces.
+    All timing uses the current_time passed in, never the wall clock.
+    """
+
+    def __init__(self, controller, pointer_filter=None, move_cursor=None, verbose=True, scroll_engine=None):
+        self.controller = controller
+        self.pointer_filter = pointer_filter or su.PointerFilter()
+        # Without a running engine, scroll units are sent as soon as they add up
+        self.scroll_engine = scroll_engine or ScrollEngine(controller.scroll, threaded=False)
+        # Cursor moves go through move_cursor (e.g. the mouse thread queue),
+        # except while dragging where they are applied immediately.
+        self.move_cursor = move_cursor or controller.point_movement
+        self.verbose = verbose
+
+        self.is_pointer_locked = False
+        self.is_dragging = False
+        self.is_scrolling = False
+        self.is_swiping = False
+        self.is_ppt_mode = False
+        self.swipe_start_x = 0
+        self.swipe_action_taken = False
+        self.scroll_start_y = 0
+        self.last_gesture = "IDLE"
+        self.last_cursor = None
+        self.velocity = 0
+
+        # Timing and gesture counts; -inf so traces starting at t=0 can click right away
+        self.last_click_time = -math.inf
+        self.last_close_gesture_time = -math.inf
+        self.close_gesture_count = 0
+
+    def _log(self, message):
+        if self.verbose:
+            print(message)
+
+    @staticmethod
+    def active_area(frame_shape):
+        """(x_min, y_min, x_max, y_max) of the frame region mapped to the screen"""
+        frame_height, frame_width = frame_shape[:2]
+        x_min_bound = int(config.FRAME_REDUCTION * frame_width)
+        y_min_bound = int(config.FRAME_REDUCTION * frame_height)
+        x_max_bound = int(frame_width - (config.FRAME_REDUCTION * frame_width))
+        y_max_bound = int(frame_height - (config.FRAME_REDUCTION * frame_height))
+        return x_min_bound, y_min_bound, x_max_bound, y_max_bound
+
+    def process(self, result, current_time, frame_shape):
+        """Run the gesture logic for one FrameResult"""
+        landmarks = result.landmarks
+        current_gesture = result.gesture
+        confidence = result.confidence
+        hand_type = result.hand_type
+        controller = self.controller
+
+        if not self.is_pointer_locked and controller.check_for_manual_failsafe():
+            self.is_pointer_locked = True
+            if self.is_dragging: controller.end_drag(); self.is_dragging = False
+            if self.is_scrolling: self.is_scrolling = False
+            self.scroll_engine.halt()
+            self._log("⏸ PAUSED")
+
+        if not self.is_pointer_locked:
+            # --- RIGHT HAND LOGIC ---
+            if hand_type == "Right":
+                if self.is_ppt_mode:
+                    self._ppt_actions(landmarks, current_gesture)
+                else:
+                    self._os_actions(result, current_time, frame_shape)
+
+            # --- LEFT HAND LOGIC (PPT MODE TOGGLE) ---
+            elif hand_type == "Left":
+                if current_gesture == "PPT" and not self.is_ppt_mode:
+                    self.is_ppt_mode = True
+                    self._log("✅ PPT Mode ACTIVATED")
+                elif current_gesture == "CLOSE" and self.is_ppt_mode:
+                    self.is_ppt_mode = False
+                    self._log("❌ PPT Mode DEACTIVATED")
+
+        else: # LOCKED STATE LOGIC
+            if current_gesture == "OPEN" and confidence > 0.8:
+                self.is_pointer_locked = False
+                self._log("▶ RESUMED")
+
+        if current_gesture != self.last_gesture:
+            metrics.inc("gesture_transitions_total", gesture=current_gesture)
+        self.last_gesture = current_gesture
+
+    def ui_state(self):
+        """Snapshot of the state the UI draws"""
+        return {
+            'is_dragging': self.is_dragging, 'is_scrolling': self.is_scrolling,
+            'is_pointer_locked': self.is_pointer_locked, 'is_ppt_mode': self.is_ppt_mode,
+            'close_gesture_count': self.close_gesture_count,
+            'last_close_gesture_time': self.last_close_gesture_time,
+            'velocity': self.velocity,
+        }
+
+    def _ppt_actions(self, landmarks, current_gesture):
+        """PPT mode actions (right hand)"""
+        controller = self.controller
+        if landmarks is not None and current_gesture == "SCROLL":
+            if not self.is_swiping:
+                self.is_swiping = True
+                self.swipe_start_x = landmarks[9, 0]
+                self.swipe_action_taken = False
+                self._log("↔️  Swipe gesture initiated")
+            elif not self.swipe_action_taken:
+                current_x = landmarks[9, 0]
+                delta_x = current_x - self.swipe_start_x
+                if abs(delta_x) > config.SWIPE_THRESHOLD:
+                    if delta_x > 0:
+                        controller.left_slide()
+                        self._log("    ➡️  Swiped Right (Action: Left Arrow)")
+                    else:
+                        controller.right_slide()
+                        self._log("    ⬅️  Swiped Left (Action: Right Arrow)")
+                    self.swipe_action_taken = True
+        elif self.is_swiping and current_gesture != "SCROLL":
+            self.is_swiping = False
+            self.swipe_start_x = 0
+            self.swipe_action_taken = False
+            self._log("↔️  Swipe gesture ended")
+
+        if current_gesture == "OPEN" and self.last_gesture != "OPEN":
+            controller.start_slide()
+            self._log("PPT Started")
+        elif current_gesture == "CLOSE" and self.last_gesture != "CLOSE":
+            controller.close_slide()
+            self._log("PPT Ended")
+
+    def _os_actions(self, result, current_time, frame_shape):
+        """Normal OS mode actions (right hand)"""
+        controller = self.controller
+        landmarks = result.landmarks
+        current_gesture = result.gesture
+        confidence = result.confidence
+        last_gesture = self.last_gesture
+
+        # SCROLL HANDLING
+        if landmarks is not None and current_gesture == "SCROLL":
+            if not self.is_scrolling:
+                self.is_scrolling = True
+                self.scroll_start_y = landmarks[12, 1]
+                self.scroll_engine.hold()
+                self._log("📜 Scroll started")
+            else:
+                current_scroll_y = landmarks[12, 1]
+                delta_y = self.scroll_start_y - current_scroll_y
+                if abs(delta_y) > config.SCROLL_DEADZONE:
+                    # Fractional units are kept by the engine, not truncated here
+                    self.scroll_engine.add(delta_y * config.SCROLL_SENSITIVITY, current_time)
+                    self.scroll_start_y = current_scroll_y
+        elif self.is_scrolling:
+            self.is_scrolling = False
+            self.scroll_start_y = 0
+            self.scroll_engine.release()
+            self._log("📜 Scroll ended")
+
+        # CURSOR MOVEMENT
+        if not self.is_scrolling and landmarks is not None and result.pointer_coords:
+            if result.cursor is not None:
+                # Already smoothed by a separate filter stage
+                current_x, current_y = result.cursor
+                if self.last_cursor is not None:
+                    self.velocity = np.hypot(current_x - self.last_cursor[0], current_y - self.last_cursor[1])
+                self.last_cursor = result.cursor
+            else:
+                screen_x, screen_y = map_to_screen(result.pointer_coords, frame_shape,
+                                                   controller.screen_width, controller.screen_height)
+                current_x, current_y = self.pointer_filter.update(screen_x, screen_y)
+                self.velocity = self.pointer_filter.velocity
+            if not self.is_dragging:
+                self.move_cursor(current_x, current_y)
+            else:
+                controller.point_movement(int(current_x), int(current_y))
+
+        # DRAG & CLICK HANDLING
+        if not self.is_scrolling:
+            if current_gesture == "PINCH" and not self.is_dragging:
+                controller.start_drag(); self.is_dragging = True; self._log("🖱 Drag started")
+            elif current_gesture != "PINCH" and self.is_dragging:
+                controller.end_drag(); self.is_dragging = False; self._log("🖱 Drag ended")
+            if not self.is_dragging and confidence > 0.7:
+                if current_gesture == "OPEN" and last_gesture != "OPEN" and (current_time - self.last_click_time) > config.CLICK_COOLDOWN:
+                    controller.left_click(); self.last_click_time = current_time; self._log("🖱 Left Click")
+                elif current_gesture == "CLOSE" and last_gesture != "CLOSE":
+                    if (current_time - self.last_close_gesture_time) < config.DOUBLE_CLICK_WINDOW and self.close_gesture_count == 1:
+                        controller.double_left_click(); self.last_click_time = current_time; self.close_gesture_count = 0; self._log("🖱🖱 Double Left Click")
+                    else:
+                        self.close_gesture_count = 1; self.last_close_gesture_time = current_time
+                elif current_gesture == "COLAPS" and last_gesture != "COLAPS":
+                    controller.colaps(); self._log("Closing folder")
+        if self.close_gesture_count == 1 and (current_time - self.last_close_gesture_time) > config.SINGLE_CLICK_DELAY:
+            controller.right_click(); self.last_click_time = current_time; self.close_gesture_count = 0; self._log("🖱 Right Click")
+
+
+class RecordingController:
+    """
+    Stand-in for ComputerController that records every action with the
+    time it was issued instead of touching the OS. Used for offline replay
+    and monitoring sessions. keep limits the recorded actions to the most
+    recent ones; counts always has the totals per action.
+    """
+
+    def __init__(self, screen_width=1920, screen_height=1080, keep=None):
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.is_dragging = False
+        self.current_time = 0
+        self.actions = [] if keep is None else deque(maxlen=keep)
+        self.counts = Counter()
+
+    def check_for_manual_failsafe(self):
+        return False
+
+    def __getattr__(self, name):
+        def record(*args):
+            self.actions.append((self.current_time, name, args))
+            self.counts[name] += 1
+        return record
@@ -3,54 +3,114 @@ import mediapipe as mp
 import math
 from collections import deque
 
+import config
+from hand_backends import create_hand_backend
+from landmark_tracker import LandmarkTracker
+
+def select_hand(hands):
+    """Pick the hand to act on from [(landmarks, hand_type)]: the left hand wins"""
+    left_hand_landmarks,  right_hand_landmarks = None, None
+    for hand_landmarks, hand_type in hands:
+        if hand_type == "Left":
+            left_hand_landmarks = hand_landmarks
+        elif hand_type == "Right":
+            right_hand_landmarks = hand_landmarks
+    if left_hand_landmarks:
+        return left_hand_landmarks, 'Left'
+    if right_hand_landmarks:
+        return right_hand_landmarks, "Right"
+    return None, None
+
+
 class GestureRecognizer:
-    def __init__(self):
+    def __init__(self, keyframe_interval=None, with_detector=True, backend=None):
+        """
+        with_detector=False skips loading the MediaPipe model, for instances
+        that only classify landmarks produced elsewhere. backend overrides
+        config.HAND_BACKEND ("solutions" or "tasks").
+        """
         self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=False,
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5,
-            model_complexity=0
-        )
+        self.detector = create_hand_backend(backend) if with_detector else None
         self.mp_drawing = mp.solutions.drawing_utils
         self.landmarks = None
+        self.active_hand_type = None
+        # False while landmarks are a repeat of an earlier result; get_gesture() then doesn't vote
+        self.is_new_result = True
+
+        # Keyframe mode: full detection every k frames, optical flow in between
+        if keyframe_interval is None:
+            keyframe_interval = config.KEYFRAME_INTERVAL if config.use_keyframe_tracking else 1
+        self.keyframe_interval = keyframe_interval
+        self.tracker = LandmarkTracker() if keyframe_interval > 1 else None
+        self.tracked_hand_type = None
+        self.frames_since_keyframe = 0
+        self.detection_count = 0
         
         # Gesture smoothing with deque for better performance
-        self.gesture_buffer = deque(maxlen=5)
+        self.gesture_buffer = deque(maxlen=config.GESTURE_BUFFER_SIZE)
         self.last_stable_gesture = "IDLE"
 
-    def find_hand_landmarks(self, frame):
+    def find_hand_landmarks(self, frame, scale=1.0):
+        """
+        Detect hands on the mirrored frame. A scale below 1.0 runs detection
+        on a downscaled copy (landmarks are normalized, so drawing still
+        happens on the full-size frame).
+        """
+        previous_landmarks, previous_hand_type = self.landmarks, self.active_hand_type
         self.landmarks = None
         self.active_hand_type = None
+        self.is_new_result = True
         
         frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.hands.process(rgb_frame)
 
-        if results.multi_hand_landmarks:
-            left_hand_landmarks,  right_hand_landmarks = None, None
+        if (self.tracker is not None and self.tracker.has_target and
+                self.frames_since_keyframe < self.keyframe_interval - 1):
+            tracked = self.tracker.track(frame)
+            if tracked is not None:
+                self.frames_since_keyframe += 1
+                self.landmarks = tracked
+                self.active_hand_type = self.tracked_hand_type
+                self._draw_landmarks(frame)
+                return frame, self.landmarks, self.active_hand_type
+
+        detect_frame = frame
+        if scale != 1.0:
+            detect_frame = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        rgb_frame = cv2.cvtColor(detect_frame, cv2.COLOR_BGR2RGB)
+        hands, self.is_new_result = self.detector.detect(rgb_frame)
+        self.detection_count += 1
+
+        if not self.is_new_result:
+            # The async backend has nothing newer: keep the previous hand for the
+            # pointer, but don't draw it on this frame or re-anchor the tracker on it
+            self.landmarks, self.active_hand_type = previous_landmarks, previous_hand_type
+            return frame, self.landmarks, self.active_hand_type
 
-            for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
-                hand_type = handedness.classification[0].label
-                if hand_type == "Left":
-                    left_hand_landmarks = hand_landmarks
-                elif hand_type == "Right":
-                    right_hand_landmarks = hand_landmarks
-            if left_hand_landmarks:
-                self.landmarks = left_hand_landmarks
-                self.active_hand_type = 'Left'
-            elif right_hand_landmarks:
-                self.landmarks = right_hand_landmarks
-                self.active_hand_type = "Right"  
+        if hands:
+            self.landmarks, self.active_hand_type = select_hand(hands)
+            self._draw_landmarks(frame)
+
+        if self.tracker is not None:
+            self.frames_since_keyframe = 0
+            self.tracked_hand_type = self.active_hand_type
             if self.landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame,
-                    self.landmarks,
-                    self.mp_hands.HAND_CONNECTIONS
-                )    
+                self.tracker.reset(frame, self.landmarks)
+            else:
+                self.tracker.clear()
 
         return frame, self.landmarks, self.active_hand_type
+
+    def close(self):
+        if self.detector is not None:
+            self.detector.close()
+
+    def _draw_landmarks(self, frame):
+        if self.landmarks:
+            self.mp_drawing.draw_landmarks(
+                frame,
+                self.landmarks,
+                self.mp_hands.HAND_CONNECTIONS
+            )
     
     def _get_distance(self, point1, point2):
         """Calculate Euclidean distance between two points"""
@@ -193,7 +253,9 @@ class GestureRecognizer:
             elif extended_count == 1 and finger_states["index"]:
                 gesture = "PPT"
                 confidence = 1.0     
-        # Add to buffer for temporal smoothing
+        # Add to buffer for temporal smoothing (a repeated result gets no second vote)
+        if not self.is_new_result:
+            return self.last_stable_gesture, confidence
         self.gesture_buffer.append(gesture)
         
         # Determine the most stable gesture from the buffer
@@ -203,16 +265,18 @@ class GestureRecognizer:
             stability = self.gesture_buffer.count(most_common) / self.gesture_buffer.maxlen
             
             # Only update the stable gesture if a new one is consistently detected
-            if stability > 0.6:  # Over 60% of recent frames agree
+            if stability > config.GESTURE_STABILITY_THRESHOLD:  # Enough recent frames agree
                 self.last_stable_gesture = most_common
         
         # Return the last known stable gesture to prevent flickering
         return self.last_stable_gesture, confidence
     
-    def get_pointer_coordinates(self, frame_shape):
+    def get_pointer_coordinates(self, frame_shape, gesture_name=None):
         """
         Get pointer coordinates. Returns valid coordinates for 'POINTING' and 'PINCH'.
         For PINCH, it returns the midpoint of the thumb and index finger for stability.
+        Pass the gesture already returned by get_gesture() for this frame to
+        avoid classifying (and pushing into the gesture buffer) a second time.
         """
         if not self.landmarks:
             return None, None, None
@@ -220,7 +284,8 @@ class GestureRecognizer:
         hand_landmarks = self.landmarks.landmark
         frame_height, frame_width, _ = frame_shape
 
-        gesture_name, confidence = self.get_gesture()
+        if gesture_name is None:
+            gesture_name, _ = self.get_gesture()
         
         # Default to no coordinates
         coords = None
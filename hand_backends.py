@@ -0,0 +1,163 @@
+# hand_backends.py
+"""
+Hand detection backends used by GestureRecognizer. detect() returns
+(hands, is_new) with hands as [(NormalizedLandmarkList, "Left"/"Right")],
+so the rest of the code is the same for either:
+
+    "solutions"  legacy mp.solutions.hands.Hands; process() blocks the caller
+                 for every frame and returns that frame's hands
+    "tasks"      MediaPipe Tasks HandLandmarker in LIVE_STREAM mode; frames
+                 are submitted with detect_async() and results arrive on a
+                 callback, so detect() returns right away with the newest
+                 finished result (usually from an earlier frame), and
+                 is_new=False when that result was already returned. Frames
+                 submitted while the graph is busy are dropped by MediaPipe.
+"""
+import os
+import threading
+import time
+from collections import deque
+
+import mediapipe as mp
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+import config
+
+LATENCY_WINDOW = 1000  # Most recent latencies kept for stats()
+
+
+class SolutionsHandBackend:
+    name = "solutions"
+
+    def __init__(self, max_num_hands=2):
+        self.hands = mp.solutions.hands.Hands(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5,
+            model_complexity=0
+        )
+        self.submitted = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+    def detect(self, rgb_frame):
+        """Hands found in this frame; always a new result"""
+        start = time.perf_counter()
+        results = self.hands.process(rgb_frame)
+        self.latencies.append(time.perf_counter() - start)
+        self.submitted += 1
+        if not results.multi_hand_landmarks:
+            return [], True
+        return [(hand_landmarks, handedness.classification[0].label)
+                for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness)], True
+
+    def stats(self):
+        return _stats(self.submitted, self.submitted, self.latencies)
+
+    def close(self):
+        self.hands.close()
+
+
+class TasksHandBackend:
+    name = "tasks"
+
+    def __init__(self, model_path=None, max_num_hands=2):
+        from mediapipe.tasks.python import BaseOptions, vision
+
+        model_path = model_path or config.HAND_LANDMARKER_MODEL
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Hand landmarker model not found at {model_path}. Download hand_landmarker.task from "
+                "https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/latest/hand_landmarker.task"
+            )
+        self.lock = threading.Lock()
+        self.latest = []
+        self.latest_timestamp_ms = -1
+        self.returned_timestamp_ms = -1
+        self.last_submitted_ms = -1
+        self.submit_times = {}
+        self.submitted = 0
+        self.completed = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+
+        options = vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=max_num_hands,
+            min_hand_detection_confidence=0.7,
+            min_hand_presence_confidence=0.5,
+            min_tracking_confidence=0.5,
+            result_callback=self._on_result,
+        )
+        self.landmarker = vision.HandLandmarker.create_from_options(options)
+
+    @staticmethod
+    def _to_proto(hand_landmarks):
+        """Tasks landmarks -> the NormalizedLandmarkList the recognizer works on"""
+        proto = landmark_pb2.NormalizedLandmarkList()
+        for lm in hand_landmarks:
+            proto.landmark.add(x=lm.x, y=lm.y, z=lm.z)
+        return proto
+
+    def _on_result(self, result, image, timestamp_ms):
+        # Runs on MediaPipe's thread
+        hands = [(self._to_proto(hand_landmarks), handedness[0].category_name)
+                 for hand_landmarks, handedness in zip(result.hand_landmarks, result.handedness)]
+        now = time.perf_counter()
+        with self.lock:
+            self.latest = hands
+            self.latest_timestamp_ms = timestamp_ms
+            self.completed += 1
+            submit_time = self.submit_times.pop(timestamp_ms, None)
+            if submit_time is not None:
+                self.latencies.append(now - submit_time)
+            # Frames the runtime dropped never get a callback
+            for stale in [t for t in self.submit_times if t < timestamp_ms]:
+                del self.submit_times[stale]
+
+    def detect(self, rgb_frame):
+        """Submit this frame; returns the newest finished result without waiting"""
+        # Timestamps must increase strictly
+        timestamp_ms = max(int(time.monotonic() * 1000), self.last_submitted_ms + 1)
+        self.last_submitted_ms = timestamp_ms
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=np.ascontiguousarray(rgb_frame))
+        with self.lock:
+            self.submit_times[timestamp_ms] = time.perf_counter()
+        self.submitted += 1
+        self.landmarker.detect_async(image, timestamp_ms)
+        with self.lock:
+            is_new = self.latest_timestamp_ms > self.returned_timestamp_ms
+            self.returned_timestamp_ms = self.latest_timestamp_ms
+            return self.latest, is_new
+
+    def stats(self):
+        with self.lock:
+            return _stats(self.submitted, self.completed, list(self.latencies))
+
+    def close(self):
+        self.landmarker.close()
+
+
+def _stats(submitted, completed, latencies):
+    return {
+        'submitted': submitted,
+        'completed': completed,
+        'dropped': max(submitted - completed, 0),
+        'latency_ms_mean': 1000 * float(np.mean(latencies)) if latencies else 0.0,
+        'latency_ms_p95': 1000 * float(np.percentile(latencies, 95)) if latencies else 0.0,
+    }
+
+
+BACKENDS = {
+    SolutionsHandBackend.name: SolutionsHandBackend,
+    TasksHandBackend.name: TasksHandBackend,
+}
+
+
+def create_hand_backend(name=None):
+    """Build the backend named by config.HAND_BACKEND (or name)"""
+    name = name or config.HAND_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown hand backend {name!r}, expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
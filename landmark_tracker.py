@@ -0,0 +1,80 @@
+# landmark_tracker.py
+import cv2
+import numpy as np
+
+import config
+from landmark_utils import landmarks_to_array
+
+
+class LandmarkTracker:
+    """
+    Propagates the 21 hand landmarks between keyframes with pyramidal
+    Lucas-Kanade optical flow on a small grayscale image. A forward-backward
+    consistency check rejects bad points; if too many fail, track() returns
+    None so the caller runs a full detection instead.
+    """
+
+    def __init__(self, scale=None):
+        self.scale = scale or config.TRACKING_SCALE
+        self.lk_params = dict(
+            winSize=(config.TRACKING_WIN_SIZE, config.TRACKING_WIN_SIZE),
+            maxLevel=config.TRACKING_PYRAMID_LEVELS,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+        self.clear()
+
+    def clear(self):
+        self.prev_gray = None
+        self.points = None
+        self.template = None
+
+    @property
+    def has_target(self):
+        return self.points is not None
+
+    def _to_gray(self, frame):
+        small = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+
+    def reset(self, frame, landmarks):
+        """Start tracking from freshly detected landmarks on frame (a keyframe)."""
+        self.prev_gray = self._to_gray(frame)
+        height, width = self.prev_gray.shape
+        points = landmarks_to_array(landmarks)[:, :2] * (width, height)
+        self.points = points.reshape(-1, 1, 2).astype(np.float32)
+        self.template = landmarks
+
+    def track(self, frame):
+        """
+        Move the landmarks onto frame. Returns a new NormalizedLandmarkList,
+        or None when tracking quality is too low to trust.
+        """
+        if not self.has_target:
+            return None
+
+        gray = self._to_gray(frame)
+        new_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, self.points, None, **self.lk_params)
+        back_points, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self.prev_gray, new_points, None, **self.lk_params)
+
+        fb_error = np.linalg.norm((self.points - back_points).reshape(-1, 2), axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < config.TRACKING_FB_MAX_ERROR)
+        if good.mean() < config.TRACKING_MIN_GOOD_FRACTION:
+            self.clear()
+            return None
+
+        # Points that failed the check follow the median motion of the hand
+        if not good.all():
+            shift = np.median((new_points - self.points)[good], axis=0)
+            new_points[~good] = self.points[~good] + shift
+
+        self.prev_gray = gray
+        self.points = new_points
+
+        height, width = gray.shape
+        tracked = type(self.template)()
+        tracked.CopyFrom(self.template)
+        for landmark, (x, y) in zip(tracked.landmark, new_points.reshape(-1, 2)):
+            landmark.x = float(x) / width
+            landmark.y = float(y) / height
+        self.template = tracked
+        return tracked
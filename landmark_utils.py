@@ -0,0 +1,42 @@
+# landmark_utils.py
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+
+NUM_LANDMARKS = 21
+
+
+def landmarks_to_array(landmarks):
+    """Convert a MediaPipe NormalizedLandmarkList into a (21, 3) float32 array"""
+    return np.array([[p.x, p.y, p.z] for p in landmarks.landmark], dtype=np.float32)
+
+
+def array_to_landmarks(array):
+    """Convert a (21, 3) or (21, 2) array back into a NormalizedLandmarkList"""
+    landmarks = landmark_pb2.NormalizedLandmarkList()
+    for point in array:
+        landmarks.landmark.add(x=float(point[0]), y=float(point[1]),
+                               z=float(point[2]) if len(point) > 2 else 0.0)
+    return landmarks
+
+
+def save_trace(path, timestamps, landmarks, hand_types, **extra):
+    """
+    Save a landmark trace as compressed .npz: timestamps (T,), landmarks
+    (T, 21, 3) with NaN rows for frames without a hand, and hand_types (T,)
+    ("Left", "Right" or ""). extra arrays are stored alongside.
+    """
+    array = np.full((len(landmarks), NUM_LANDMARKS, 3), np.nan, dtype=np.float32)
+    for i, frame_landmarks in enumerate(landmarks):
+        if frame_landmarks is not None:
+            array[i] = frame_landmarks
+    np.savez_compressed(path,
+                        timestamps=np.asarray(timestamps, dtype=np.float64),
+                        landmarks=array,
+                        hand_types=np.array([h or "" for h in hand_types], dtype="U5"),
+                        **extra)
+
+
+def load_trace(path):
+    """Load a trace written by save_trace as a dict of arrays"""
+    with np.load(path) as data:
+        return {key: data[key] for key in ('timestamps', 'landmarks', 'hand_types')}
@@ -0,0 +1,162 @@
+# metrics.py
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+
+# name: (type, help) for every metric the pipeline reports
+METRIC_DEFINITIONS = {
+    'frames_captured_total': ('counter', 'Frames decoded from the capture source'),
+    'frames_processed_total': ('counter', 'Frames processed by the gesture stage'),
+    'frames_dropped_total': ('counter', 'Items dropped because a downstream queue was full'),
+    'stale_results_total': ('counter', 'Results passed on with a repeated, not new, detection'),
+    'gesture_transitions_total': ('counter', 'Changes of the stable gesture'),
+    'actions_total': ('counter', 'Mouse/keyboard actions sent to the OS'),
+    'controller_errors_total': ('counter', 'Errors raised while sending actions to the OS'),
+    'queue_depth': ('gauge', 'Current number of items waiting in a queue'),
+    'ui_fps': ('gauge', 'Main loop frames per second'),
+    'capture_fps': ('gauge', 'Frame rate achieved by the capture source'),
+    'pipeline_latency_ms': ('gauge', 'Age of the result used by the main loop since capture'),
+    'pipeline_idle': ('gauge', '1 while the pipeline runs at the idle rate'),
+    'stage_utilization': ('gauge', 'Fraction of wall time a pipeline stage spent processing'),
+    'stage_items': ('gauge', 'Items a pipeline stage has handled'),
+    'stage_dropped': ('gauge', 'Items dropped in front of a pipeline stage, from every process'),
+    'thread_cpu_seconds_total': ('counter', 'CPU time used by a thread; "native" sums threads started outside Python'),
+}
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """Thread-safe counters and gauges, keyed by name and label set"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {}
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def set_gauge(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.values[key] = value
+
+    def get(self, name, **labels):
+        with self.lock:
+            return self.values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def snapshot(self):
+        """Flat {"name{label=...}": value} copy of all metrics"""
+        with self.lock:
+            items = sorted(self.values.items())
+        return {name + _format_labels(labels): value for (name, labels), value in items}
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        with self.lock:
+            items = sorted(self.values.items())
+        lines = []
+        current_name = None
+        for (name, labels), value in items:
+            if name != current_name:
+                current_name = name
+                metric_type, help_text = METRIC_DEFINITIONS.get(name, ('untyped', name))
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry used by every module
+metrics = MetricsRegistry()
+
+
+class MetricsExporter:
+    """
+    Publishes a registry over a local HTTP endpoint (Prometheus text on
+    /metrics) and/or by periodically writing a JSON snapshot to disk.
+    """
+
+    def __init__(self, registry=None, port=None, host=None, json_path=None, json_interval=None):
+        self.registry = registry or metrics
+        self.port = config.METRICS_HTTP_PORT if port is None else port
+        self.host = host or config.METRICS_HTTP_HOST
+        self.json_path = json_path or config.METRICS_JSON_PATH
+        self.json_interval = json_interval or config.METRICS_JSON_INTERVAL
+        self.server = None
+        self.stop_event = threading.Event()
+        self.threads = []
+
+    def start(self):
+        if self.port:
+            registry = self.registry
+
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path.split("?")[0] != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = registry.render_prometheus().encode("utf-8")
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format, *args):
+                    pass  # Keep scrapes out of the console
+
+            try:
+                self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+                self.server.daemon_threads = True
+                thread = threading.Thread(target=self.server.serve_forever, name="metrics-http", daemon=True)
+                thread.start()
+                self.threads.append(thread)
+                print(f"✓ Metrics at http://{self.host}:{self.port}/metrics")
+            except OSError as e:
+                print(f"Metrics endpoint error: {e}")
+                self.server = None
+
+        if self.json_path:
+            thread = threading.Thread(target=self._json_loop, name="metrics-json", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+            print(f"✓ Metrics written to {self.json_path} every {self.json_interval}s")
+
+    def write_json(self):
+        """Write a snapshot atomically so readers never see a partial file"""
+        snapshot = {'timestamp': time.time(), 'metrics': self.registry.snapshot()}
+        temp_path = self.json_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(temp_path, self.json_path)
+
+    def _json_loop(self):
+        while not self.stop_event.wait(self.json_interval):
+            try:
+                self.write_json()
+            except OSError as e:
+                print(f"Metrics file error: {e}")
+
+    def stop(self):
+        self.stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.json_path:
+            try:
+                self.write_json()
+            except OSError as e:
+                print(f"Metrics file error: {e}")
+        for thread in self.threads:
+            thread.join(timeout=1.0)
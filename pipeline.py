@@ -0,0 +1,338 @@
+# pipeline.py
+"""
+Small runtime for a linear stage graph (capture -> detect -> ... -> render).
+
+Each Stage wraps a factory that builds the stage object inside the worker
+that runs it; the object needs process(item) -> item (return None to
+consume an item, or raise StopIteration from a source to end the stream)
+and may have close(). A stage's placement decides where it runs:
+
+    "thread"   its own daemon thread
+    "process"  its own process (factory, items and results must pickle)
+    "inline"   fused into the worker of the stage before it
+    "main"     in the caller's thread, driven by Pipeline.step()
+
+Stages in different workers talk through bounded mailboxes. Shutdown is
+deterministic: stop() ends the source, a STOP marker then flows down the
+chain and every worker closes its stages in order before passing it on.
+"""
+import multiprocessing
+import queue
+import threading
+import time
+
+from metrics import metrics
+
+STOP = "__pipeline_stop__"
+
+# Pipeline.step() results
+ITEM = "item"
+EMPTY = "empty"
+STOPPED = "stopped"
+
+PLACEMENTS = ("thread", "process", "inline", "main")
+DROP_POLICIES = ("drop_new", "drop_oldest", "block")
+
+# Spawn everywhere: MediaPipe's threads don't survive a fork, and mixing
+# fork-made queues with spawned processes is not allowed
+mp_context = multiprocessing.get_context("spawn")
+
+# Indices into the shared per-stage stats array
+_ITEMS, _BUSY, _DROPPED = 0, 1, 2
+
+
+def _is_stop(item):
+    return isinstance(item, str) and item == STOP
+
+
+class Stage:
+    """Description of one stage: what to build, where to run it, how to queue its input"""
+
+    def __init__(self, name, factory, placement="thread", mailbox=2, drop_policy="drop_new", args=()):
+        if placement not in PLACEMENTS:
+            raise ValueError(f"Stage {name}: unknown placement {placement!r}")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Stage {name}: unknown drop policy {drop_policy!r}")
+        self.name = name
+        self.factory = factory
+        self.placement = placement
+        self.mailbox = mailbox
+        self.drop_policy = drop_policy
+        self.args = args
+        # Shared with process workers so stats survive the process boundary
+        self.stats = mp_context.Array('d', 3, lock=False)
+
+
+def _put(mailbox, item, stage, stop_event):
+    """Deliver item to the mailbox in front of stage according to its drop policy"""
+    policy = stage.drop_policy
+    if policy == "block":
+        while not stop_event.is_set():
+            try:
+                mailbox.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+        return
+    try:
+        mailbox.put_nowait(item)
+        return
+    except queue.Full:
+        pass
+    stage.stats[_DROPPED] += 1
+    metrics.inc("frames_dropped_total", queue=stage.name)
+    if policy == "drop_oldest":
+        try:
+            mailbox.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            mailbox.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def _put_stop(mailbox, stop_event):
+    """
+    STOP must never be dropped. At end of stream it waits behind the queued
+    items; once stop() was called it evicts them to get through.
+    """
+    while True:
+        try:
+            mailbox.put(STOP, timeout=0.1)
+            return
+        except queue.Full:
+            if not stop_event.is_set():
+                continue
+            try:
+                mailbox.get_nowait()
+            except queue.Empty:
+                pass
+
+
+class _Worker:
+    """A group of stages executed back to back by one thread/process/the caller"""
+
+    def __init__(self, stages, inbox, outbox, out_stage, stop_event, shared):
+        self.stages = stages
+        self.inbox = inbox
+        self.outbox = outbox
+        self.out_stage = out_stage
+        self.stop_event = stop_event
+        self.shared = shared
+        self.objects = None
+        self.finished = False
+
+    def build(self):
+        self.objects = [stage.factory(self.shared, *stage.args) for stage in self.stages]
+
+    def run_item(self, item):
+        """Push one item through the group. Returns False if the source ended."""
+        is_source = self.inbox is None
+        for stage, obj in zip(self.stages, self.objects):
+            # Time a stage spends waiting for input (e.g. a source in grab())
+            # is reported by it as wait_time and is not busy time
+            wait_before = getattr(obj, "wait_time", 0.0)
+            start = time.perf_counter()
+            try:
+                item = obj.process(item)
+            except StopIteration:
+                return False
+            finally:
+                waited = getattr(obj, "wait_time", 0.0) - wait_before
+                stage.stats[_BUSY] += time.perf_counter() - start - waited
+            # Sources count items produced, every other stage items consumed
+            if not is_source:
+                stage.stats[_ITEMS] += 1
+            if item is None:
+                return True
+            if is_source:
+                stage.stats[_ITEMS] += 1
+                is_source = False
+        if self.outbox is not None:
+            _put(self.outbox, item, self.out_stage, self.stop_event)
+        return True
+
+    def step(self, timeout):
+        """Run the group once. Returns ITEM, EMPTY or STOPPED."""
+        if self.finished:
+            return STOPPED
+        if self.inbox is None:
+            if self.stop_event.is_set() or not self.run_item(None):
+                self.finish()
+                return STOPPED
+            return ITEM
+        try:
+            item = self.inbox.get(timeout=timeout)
+        except queue.Empty:
+            return EMPTY
+        if _is_stop(item) or not self.run_item(item):
+            self.finish()
+            return STOPPED
+        return ITEM
+
+    def finish(self):
+        if self.finished:
+            return
+        self.finished = True
+        for stage, obj in zip(self.stages, self.objects or []):
+            close = getattr(obj, "close", None)
+            if close:
+                try:
+                    close()
+                except Exception as e:
+                    print(f"Error closing stage {stage.name}: {e}")
+        if self.outbox is not None:
+            _put_stop(self.outbox, self.stop_event)
+
+    def loop(self):
+        try:
+            self.build()
+            while self.step(0.1) != STOPPED:
+                pass
+        except Exception as e:
+            print(f"Stage {'+'.join(s.name for s in self.stages)} failed: {e}")
+        finally:
+            self.finish()
+
+
+def _run_worker(worker):
+    worker.loop()
+
+
+class Pipeline:
+    """Runs a linear chain of Stages according to their placements"""
+
+    def __init__(self, stages, shared=None):
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        if stages[0].placement == "inline":
+            raise ValueError(f"First stage {stages[0].name} cannot be inline")
+        self.stages = stages
+        self.shared = shared
+        self.uses_processes = any(s.placement == "process" for s in stages)
+        self.stop_event = mp_context.Event() if self.uses_processes else threading.Event()
+
+        # Group inline stages with the stage before them
+        groups = []
+        for stage in stages:
+            if stage.placement == "inline":
+                groups[-1].append(stage)
+            else:
+                groups.append([stage])
+        if sum(g[0].placement == "main" for g in groups) > 1:
+            raise ValueError("At most one worker group can run on the main thread")
+
+        self.mailboxes = []
+        for group in groups[1:]:
+            head = group[0]
+            if self.uses_processes:
+                self.mailboxes.append(mp_context.Queue(maxsize=head.mailbox))
+            else:
+                self.mailboxes.append(queue.Queue(maxsize=head.mailbox))
+
+        self.workers = []
+        for i, group in enumerate(groups):
+            inbox = self.mailboxes[i - 1] if i > 0 else None
+            outbox = self.mailboxes[i] if i < len(self.mailboxes) else None
+            out_stage = groups[i + 1][0] if i + 1 < len(groups) else None
+            self.workers.append(_Worker(group, inbox, outbox, out_stage, self.stop_event,
+                                        None if group[0].placement == "process" else shared))
+        self.main_worker = next((w for w in self.workers if w.stages[0].placement == "main"), None)
+        self.runners = []
+        self.start_time = None
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        # Build the main-thread group here so its setup errors surface to the caller
+        if self.main_worker:
+            # Name the caller's thread after its stages, like the worker threads
+            threading.current_thread().name = "+".join(s.name for s in self.main_worker.stages)
+            self.main_worker.build()
+        for worker in self.workers:
+            placement = worker.stages[0].placement
+            name = "+".join(s.name for s in worker.stages)
+            if placement == "thread":
+                runner = threading.Thread(target=worker.loop, name=name, daemon=True)
+            elif placement == "process":
+                runner = mp_context.Process(target=_run_worker, args=(worker,), name=name, daemon=True)
+            else:
+                continue
+            runner.start()
+            self.runners.append(runner)
+
+    def step(self, timeout=0.0):
+        """Drive the main-thread group once. Returns ITEM, EMPTY or STOPPED."""
+        if self.main_worker is None:
+            return STOPPED if self.stop_event.is_set() else EMPTY
+        return self.main_worker.step(timeout)
+
+    def stop(self, timeout=2.0):
+        """Stop the source and wait for every worker to drain and close in order"""
+        self.stop_event.set()
+        deadline = time.perf_counter() + timeout
+        for worker, runner in zip([w for w in self.workers if w.stages[0].placement in ("thread", "process")], self.runners):
+            # Let the main group consume STOP while upstream workers drain
+            while runner.is_alive() and time.perf_counter() < deadline:
+                runner.join(timeout=0.05)
+                if self.main_worker:
+                    self.main_worker.step(0)
+            if runner.is_alive():
+                print(f"Stage worker {runner.name} did not stop in time")
+                if isinstance(runner, multiprocessing.process.BaseProcess):
+                    runner.terminate()
+        if self.main_worker:
+            while self.main_worker.step(0.05) != STOPPED and time.perf_counter() < deadline:
+                pass
+            self.main_worker.finish()
+
+    def stage_object(self, name):
+        """The built object of a stage running in this process, or None"""
+        for worker in self.workers:
+            if worker.stages[0].placement == "process":
+                continue
+            for stage, obj in zip(worker.stages, worker.objects or []):
+                if stage.name == name:
+                    return obj
+        return None
+
+    def stats(self):
+        """Per-stage counters and utilization (busy time / wall time)"""
+        elapsed = time.perf_counter() - self.start_time if self.start_time else 0.0
+        result = {}
+        for stage in self.stages:
+            busy = stage.stats[_BUSY]
+            result[stage.name] = {
+                'placement': stage.placement,
+                'items': int(stage.stats[_ITEMS]),
+                'dropped': int(stage.stats[_DROPPED]),
+                'busy_s': busy,
+                'utilization': busy / elapsed if elapsed > 0 else 0.0,
+            }
+        return result
+
+    def publish_stats(self):
+        """Copy stage stats into the metrics registry"""
+        for name, stats in self.stats().items():
+            metrics.set_gauge("stage_utilization", stats['utilization'], stage=name)
+            metrics.set_gauge("stage_items", stats['items'], stage=name)
+            # Shared across processes, unlike frames_dropped_total from a process-placed producer
+            metrics.set_gauge("stage_dropped", stats['dropped'], stage=name)
+
+    def publish_queue_depths(self):
+        """Set queue_depth for every mailbox, labelled with the stage it feeds"""
+        for worker in self.workers:
+            if worker.inbox is None:
+                continue
+            try:
+                depth = worker.inbox.qsize()
+            except NotImplementedError:  # multiprocessing queues on macOS
+                continue
+            metrics.set_gauge("queue_depth", depth, queue=worker.stages[0].name)
+
+    def report(self):
+        lines = [f"{'stage':<10} | {'placement':<8} | {'items':>7} | {'dropped':>7} | {'util':>6}"]
+        for name, stats in self.stats().items():
+            lines.append(f"{name:<10} | {stats['placement']:<8} | {stats['items']:>7} | "
+                         f"{stats['dropped']:>7} | {100 * stats['utilization']:>5.1f}%")
+        return "\n".join(lines)
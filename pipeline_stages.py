@@ -0,0 +1,253 @@
+# pipeline_stages.py
+"""
+The stages main.py runs through pipeline.Pipeline:
+
+    capture -> detect -> classify -> filter -> act -> render
+
+Each stage class is built inside the worker that runs it and gets the
+PipelineContext of that process. Process-placed stages get None and build
+their own, so e.g. the adaptive rate is then not shared with them. The
+controller and pyautogui imports are deferred to the stages that use them.
+"""
+import math
+import time
+
+import cv2
+import numpy as np
+
+import config
+import smoothing_utils as su
+import ui_utils as ui
+from frame_result import FrameResult
+from frame_sources import create_frame_source
+from gesture_actions import GestureActionHandler, RecordingController, map_to_screen
+from gesture_recognizer import GestureRecognizer
+from metrics import metrics
+from pipeline import Stage
+from rate_controller import AdaptiveRateController
+from scroll_engine import ScrollEngine
+
+WINDOW_NAME = 'Hand Gesture Control - STABLE MODE'
+
+
+class PipelineContext:
+    """State shared by the stages running in one process"""
+
+    def __init__(self, adaptive_rate=True):
+        # Without adaptive rate the pipeline never drops to the idle rate (benchmarks)
+        self.rate = AdaptiveRateController(idle_after_frames=None if adaptive_rate else math.inf)
+
+
+def _context(shared):
+    return shared if shared is not None else PipelineContext()
+
+
+class CaptureStage:
+    """Source stage: grabs every frame, decodes only the ones the rate controller wants"""
+
+    def __init__(self, shared, source=None, realtime=True):
+        self.rate = _context(shared).rate
+        source = config.CAPTURE_SOURCE if source is None else source
+        self.cap = create_frame_source(source, realtime=realtime)
+        self.wait_time = 0.0  # Seconds blocked in grab(); excluded from the stage's busy time
+        if not self.cap.is_opened():
+            raise IOError(f"Could not open capture source {source}")
+        print(f"Capture source {source} is open.")
+
+    def process(self, _):
+        # grab() keeps the driver buffer drained at camera rate; the costly
+        # decode in retrieve() only happens for frames we actually process.
+        wait_start = time.perf_counter()
+        grabbed = self.cap.grab()
+        if not grabbed and self.cap.live:
+            time.sleep(0.1)
+        self.wait_time += time.perf_counter() - wait_start
+        if not grabbed:
+            if not self.cap.live:
+                raise StopIteration
+            return None
+        if not self.rate.should_retrieve():
+            return None
+        success, frame = self.cap.retrieve()
+        if not success:
+            return None
+        metrics.inc("frames_captured_total")
+        metrics.set_gauge("capture_fps", self.cap.achieved_fps)
+        return time.time(), frame
+
+    def close(self):
+        if self.cap.is_opened():
+            print(f"Achieved capture rate: {self.cap.achieved_fps:.1f} FPS")
+            self.cap.release()
+            print("Camera released.")
+
+
+class DetectStage:
+    """(capture_time, frame) -> (capture_time, mirrored frame, landmarks, hand_type, is_new)"""
+
+    def __init__(self, shared):
+        self.rate = _context(shared).rate
+        self.recognizer = GestureRecognizer()
+
+    def process(self, item):
+        capture_time, frame = item
+        if self.rate.should_detect(frame):
+            processed_frame, landmarks, hand_type = self.recognizer.find_hand_landmarks(frame, self.rate.detection_scale())
+            is_new = self.recognizer.is_new_result
+            if is_new:
+                self.rate.update(landmarks is not None)
+        else:
+            # Idle and nothing moved: skip the detector entirely
+            processed_frame, landmarks, hand_type, is_new = cv2.flip(frame, 1), None, None, True
+        return capture_time, processed_frame, landmarks, hand_type, is_new
+
+    def close(self):
+        self.recognizer.close()
+
+
+class ClassifyStage:
+    """Detection output -> FrameResult with the stable gesture and pointer position"""
+
+    def __init__(self, shared):
+        self.recognizer = GestureRecognizer(with_detector=False)
+
+    def process(self, item):
+        capture_time, frame, landmarks, hand_type, is_new = item
+        recognizer = self.recognizer
+        recognizer.landmarks = landmarks
+        recognizer.active_hand_type = hand_type
+        recognizer.is_new_result = is_new
+        if not is_new:
+            # The detector returned its previous result again (async backend)
+            metrics.inc("stale_results_total")
+        current_gesture, confidence = recognizer.get_gesture()
+        pointer_coords = None
+        if landmarks is not None:
+            pointer_coords, _, _ = recognizer.get_pointer_coordinates(frame.shape, current_gesture)
+        metrics.inc("frames_processed_total")
+        return FrameResult.from_recognizer(frame, landmarks, hand_type, current_gesture, confidence,
+                                           pointer_coords, capture_time, time.time())
+
+
+class FilterStage:
+    """Smooths the right hand's pointer into screen coordinates (FrameResult.cursor)"""
+
+    def __init__(self, shared, screen_size=None):
+        if screen_size is None:
+            import pyautogui
+            screen_size = pyautogui.size()
+        self.screen_width, self.screen_height = screen_size
+        self.pointer_filter = su.PointerFilter()
+
+    def process(self, result):
+        if result.hand_type != "Right" or result.pointer_coords is None:
+            return result
+        screen_x, screen_y = map_to_screen(result.pointer_coords, result.frame.shape,
+                                           self.screen_width, self.screen_height)
+        return result._replace(cursor=self.pointer_filter.update(screen_x, screen_y))
+
+
+class ActStage:
+    """
+    Runs the gesture actions; passes (result, ui state) on to the renderer.
+    sink="os" drives the real mouse/keyboard, "record" only records actions.
+    """
+
+    def __init__(self, shared, sink="os", keep_actions=None):
+        self.recording = sink == "record"
+        if self.recording:
+            self.controller = RecordingController(keep=keep_actions)
+            self.scroll_engine = ScrollEngine(self.controller.scroll, threaded=False)
+        else:
+            from computer_controller import ComputerController
+            self.controller = ComputerController()
+            self.scroll_engine = ScrollEngine(self.controller.scroll).start()
+        self.handler = GestureActionHandler(
+            self.controller,
+            move_cursor=lambda x, y: self.controller.point_movement(int(x), int(y)),
+            scroll_engine=self.scroll_engine,
+            verbose=not self.recording
+        )
+
+    def process(self, result):
+        if self.recording:
+            self.controller.current_time = time.time()
+        self.handler.process(result, time.time(), result.frame.shape)
+        metrics.set_gauge("pipeline_latency_ms", 1000 * (time.time() - result.capture_time))
+        return result, self.handler.ui_state()
+
+    def action_counts(self):
+        """Actions sent so far by name (record sink only)"""
+        return self.controller.counts if self.recording else {}
+
+    def close(self):
+        self.scroll_engine.stop()
+        if not self.recording:
+            self.controller.failsafe_cleanup()
+
+
+class RenderStage:
+    """Draws the UI and shows the frame. Must run on the main thread."""
+
+    def __init__(self, shared, window_name=WINDOW_NAME):
+        self.rate = _context(shared).rate
+        self.window_name = window_name
+        self.prev_frame_time = 0
+        # Show a loading screen until the first frame is processed
+        loading_frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        cv2.putText(loading_frame, "Waiting for camera...", (450, 360), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        cv2.imshow(self.window_name, loading_frame)
+
+    def process(self, item):
+        result, action_state = item
+        new_frame_time = time.time()
+        fps = 1 / (new_frame_time - self.prev_frame_time) if self.prev_frame_time > 0 else 0
+        self.prev_frame_time = new_frame_time
+        metrics.set_gauge("ui_fps", fps)
+        metrics.set_gauge("pipeline_idle", int(self.rate.is_idle))
+
+        frame = result.frame
+        x_min_bound, y_min_bound, x_max_bound, y_max_bound = GestureActionHandler.active_area(frame.shape)
+        ui_state = dict(action_state)
+        ui_state.update({
+            'fps': fps, 'current_gesture': result.gesture, 'confidence': result.confidence,
+            'x_min_bound': x_min_bound, 'y_min_bound': y_min_bound,
+            'x_max_bound': x_max_bound, 'y_max_bound': y_max_bound,
+            'active_area_color': (0, 0, 255) if action_state['is_pointer_locked'] else (255, 255, 0),
+            'pointer_coords': result.pointer_coords,
+        })
+        ui.draw_ui_elements(frame, ui_state)
+        cv2.imshow(self.window_name, frame)
+        return None
+
+
+# Factories by stage name, in pipeline order
+STAGE_FACTORIES = {
+    'capture': CaptureStage,
+    'detect': DetectStage,
+    'classify': ClassifyStage,
+    'filter': FilterStage,
+    'act': ActStage,
+    'render': RenderStage,
+}
+
+
+def build_stages(stage_config=None, drop_policy=None, factories=None, stage_args=None):
+    """
+    Stage list for pipeline.Pipeline from config.PIPELINE_STAGES. factories
+    replaces stage classes by name, stage_args passes extra constructor
+    arguments by name (e.g. {'capture': ("video.mp4",)}).
+    """
+    stage_args = stage_args or {}
+    stage_config = stage_config or config.PIPELINE_STAGES
+    drop_policy = drop_policy or config.PIPELINE_DROP_POLICY
+    factories = dict(STAGE_FACTORIES, **(factories or {}))
+    stages = []
+    for name, factory in factories.items():
+        options = stage_config.get(name, {})
+        stages.append(Stage(name, factory,
+                            placement=options.get('placement', 'thread'),
+                            mailbox=options.get('mailbox', 2),
+                            drop_policy=options.get('drop_policy', drop_policy),
+                            args=tuple(stage_args.get(name, ()))))
+    return stages
@@ -0,0 +1,204 @@
+# profiler.py
+"""
+Built-in profiling for the running app.
+
+SamplingProfiler samples the Python stack of every thread at a fixed
+interval while it is on, and writes the samples as collapsed stacks
+(one "thread;outer;...;inner count" line per stack) that flamegraph.pl,
+speedscope or inferno read directly. Toggle it with the PROFILER_KEY in the
+UI window or with SIGUSR1 (kill -USR1 <pid>).
+
+ThreadCpuMonitor logs how much CPU each thread used since the last report.
+Threads started outside Python (MediaPipe's and OpenCV's workers) are
+summed as "native" where /proc is available, and whatever the process used
+beyond the listed threads (e.g. threads that have exited) as "unattributed".
+
+Threads are named after their pipeline stages, so both outputs show
+capture, detect+classify+filter, act, render and so on. Stages placed in
+their own process are not visible from here.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+import config
+from metrics import metrics
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    # ';' separates frames in the collapsed format
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class SamplingProfiler:
+    """Low-overhead stack sampler for all threads; start()/stop() at any time"""
+
+    def __init__(self, interval=None, output_dir=None):
+        self.interval = interval or config.PROFILER_INTERVAL
+        self.output_dir = output_dir or config.PROFILER_OUTPUT_DIR
+        self.samples = Counter()
+        self.sample_count = 0
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.start_time = None
+
+    @property
+    def running(self):
+        return self.thread is not None
+
+    # start/stop/toggle are called from the main thread (UI key or signal handler)
+    def start(self):
+        if self.running:
+            return
+        self.samples = Counter()
+        self.sample_count = 0
+        self.stop_event.clear()
+        self.start_time = time.time()
+        self.thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self.thread.start()
+        print(f"🔬 Profiler started ({1 / self.interval:.0f} Hz)")
+
+    def stop(self):
+        """Stop sampling and write the collapsed stacks. Returns the file path."""
+        if not self.running:
+            return None
+        self.stop_event.set()
+        self.thread.join(timeout=1.0)
+        self.thread = None
+        path = self.dump()
+        print(f"🔬 Profiler stopped: {self.sample_count} samples -> {path}")
+        return path
+
+    def toggle(self):
+        if self.running:
+            self.stop()
+        else:
+            self.start()
+
+    def _run(self):
+        own_ident = threading.get_ident()
+        while not self.stop_event.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+
+    def dump(self, path=None):
+        """Write the samples in collapsed-stack format"""
+        if path is None:
+            os.makedirs(self.output_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.start_time))
+            path = os.path.join(self.output_dir, f"profile-{stamp}.folded")
+        with open(path, "w") as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write(f"{stack} {count}\n")
+        return path
+
+
+def install_signal_toggle(profiler):
+    """Toggle the profiler on SIGUSR1 where the platform has it"""
+    if not hasattr(signal, "SIGUSR1"):
+        return False
+    signal.signal(signal.SIGUSR1, lambda signum, frame: profiler.toggle())
+    return True
+
+
+def _task_cpu_time(tid):
+    """utime + stime of a task from /proc/self/task/<tid>/stat (Linux), or None"""
+    try:
+        with open(f"/proc/self/task/{tid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _thread_cpu_time(thread):
+    """CPU seconds used by a thread, or None if it can't be read"""
+    if hasattr(time, "pthread_getcpuclockid"):
+        try:
+            return time.clock_gettime(time.pthread_getcpuclockid(thread.ident))
+        except (OSError, OverflowError, TypeError):
+            pass
+    return _task_cpu_time(thread.native_id) if getattr(thread, "native_id", None) else None
+
+
+def _native_task_ids(python_tids):
+    """Thread ids of this process that have no Python thread object"""
+    try:
+        return [int(tid) for tid in os.listdir("/proc/self/task") if int(tid) not in python_tids]
+    except (OSError, ValueError):
+        return []
+
+
+class ThreadCpuMonitor:
+    """Per-thread CPU usage, logged every THREAD_CPU_LOG_INTERVAL seconds"""
+
+    def __init__(self, report_interval=None):
+        self.report_interval = config.THREAD_CPU_LOG_INTERVAL if report_interval is None else report_interval
+        threads = threading.enumerate()
+        self.last_cpu = {thread.ident: _thread_cpu_time(thread) or 0.0 for thread in threads}
+        self.last_native = {tid: _task_cpu_time(tid) or 0.0
+                            for tid in _native_task_ids({t.native_id for t in threads})}
+        self.native_total = 0.0
+        self.last_process = time.process_time()
+        self.last_wall = time.perf_counter()
+        self.usage = {}
+
+    def sample(self):
+        """Update per-thread usage; prints a report when the interval has passed"""
+        wall = time.perf_counter()
+        if wall - self.last_wall < self.report_interval:
+            return
+        elapsed = wall - self.last_wall
+        self.last_wall = wall
+
+        usage = {}
+        listed = 0.0
+        threads = threading.enumerate()
+        for thread in threads:
+            cpu = _thread_cpu_time(thread)
+            if cpu is None:
+                continue
+            metrics.set_gauge("thread_cpu_seconds_total", cpu, thread=thread.name)
+            # Threads seen for the first time started after the previous report
+            previous = self.last_cpu.get(thread.ident, 0.0)
+            self.last_cpu[thread.ident] = cpu
+            usage[thread.name] = 100.0 * (cpu - previous) / elapsed
+            listed += cpu - previous
+
+        # Threads without a Python object, summed into one bucket
+        native = {}
+        for tid in _native_task_ids({t.native_id for t in threads}):
+            cpu = _task_cpu_time(tid)
+            if cpu is not None:
+                native[tid] = cpu
+        if native:
+            used = sum(cpu - self.last_native.get(tid, 0.0) for tid, cpu in native.items())
+            self.native_total += used
+            metrics.set_gauge("thread_cpu_seconds_total", self.native_total, thread="native")
+            usage["native"] = 100.0 * used / elapsed
+            listed += used
+        self.last_native = native
+
+        process = time.process_time()
+        usage["unattributed"] = 100.0 * max(0.0, process - self.last_process - listed) / elapsed
+        self.last_process = process
+        self.usage = usage
+        if usage:
+            print(self.report())
+
+    def report(self):
+        parts = [f"{name}: {percent:.1f}%" for name, percent in sorted(self.usage.items(), key=lambda item: -item[1])]
+        return "🧵 Thread CPU " + " | ".join(parts)
@@ -0,0 +1,122 @@
+# rate_controller.py
+import time
+import threading
+import cv2
+import numpy as np
+
+import config
+
+
+class AdaptiveRateController:
+    """
+    Switches the pipeline between full-rate ACTIVE mode and a low-rate IDLE
+    presence check. The gesture thread reports whether a hand was found;
+    the camera thread and main loop ask how fast they should run.
+    """
+
+    ACTIVE = "ACTIVE"
+    IDLE = "IDLE"
+
+    def __init__(self, idle_after_frames=None, idle_check_fps=None):
+        self.idle_after_frames = idle_after_frames or config.IDLE_AFTER_FRAMES
+        self.idle_interval = 1.0 / (idle_check_fps or config.IDLE_CHECK_FPS)
+        self.state = self.ACTIVE
+        self.frames_without_hand = 0
+        self.last_idle_capture = 0
+        self.last_detection_time = 0
+        self.prev_small_gray = None
+        self.lock = threading.Lock()
+
+    @property
+    def is_idle(self):
+        return self.state == self.IDLE
+
+    def should_retrieve(self, current_time=None):
+        """
+        Called by the camera thread after every grab(). While active every
+        frame is decoded; while idle only one frame per idle interval is.
+        """
+        if self.state == self.ACTIVE:
+            return True
+        current_time = current_time or time.time()
+        if current_time - self.last_idle_capture >= self.idle_interval:
+            self.last_idle_capture = current_time
+            return True
+        return False
+
+    def detection_scale(self):
+        """Scale factor applied to the detection input for the current state."""
+        return config.IDLE_DETECTION_SCALE if self.state == self.IDLE else 1.0
+
+    def should_detect(self, frame, current_time=None):
+        """
+        Motion gate for idle mode. Returns False when the frame is almost
+        identical to the previous one so the hand detector can be skipped.
+        Always returns True while active.
+        """
+        current_time = current_time or time.time()
+        if self.state == self.ACTIVE or not config.use_motion_gate:
+            self.prev_small_gray = None
+            return True
+
+        small = cv2.resize(frame, config.MOTION_GATE_SIZE, interpolation=cv2.INTER_AREA)
+        small_gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        prev, self.prev_small_gray = self.prev_small_gray, small_gray
+        if prev is None:
+            return True
+        if current_time - self.last_detection_time > config.MOTION_FORCED_CHECK_INTERVAL:
+            return True
+
+        motion = np.mean(cv2.absdiff(small_gray, prev))
+        return motion > config.MOTION_THRESHOLD
+
+    def update(self, hand_present, current_time=None):
+        """Report the outcome of a detection pass and update the state."""
+        current_time = current_time or time.time()
+        with self.lock:
+            self.last_detection_time = current_time
+            if hand_present:
+                self.frames_without_hand = 0
+                if self.state == self.IDLE:
+                    self.state = self.ACTIVE
+                    print("⚡ Hand detected - full rate")
+            else:
+                self.frames_without_hand += 1
+                if self.state == self.ACTIVE and self.frames_without_hand >= self.idle_after_frames:
+                    self.state = self.IDLE
+                    self.last_idle_capture = current_time
+                    print("💤 No hand - idle rate")
+
+
+class CpuUsageMonitor:
+    """Tracks process CPU usage split by the controller state it was spent in."""
+
+    def __init__(self, report_interval=None):
+        self.report_interval = config.CPU_REPORT_INTERVAL if report_interval is None else report_interval
+        self.cpu_time = {AdaptiveRateController.ACTIVE: 0.0, AdaptiveRateController.IDLE: 0.0}
+        self.wall_time = {AdaptiveRateController.ACTIVE: 0.0, AdaptiveRateController.IDLE: 0.0}
+        self.last_cpu = time.process_time()
+        self.last_wall = time.perf_counter()
+        self.last_report = self.last_wall
+
+    def sample(self, state):
+        """Attribute the CPU and wall time since the last sample to state."""
+        cpu, wall = time.process_time(), time.perf_counter()
+        self.cpu_time[state] += cpu - self.last_cpu
+        self.wall_time[state] += wall - self.last_wall
+        self.last_cpu, self.last_wall = cpu, wall
+
+        if self.report_interval and wall - self.last_report >= self.report_interval:
+            self.last_report = wall
+            print(self.report())
+
+    def usage(self, state):
+        """Average CPU usage in percent of one core for the given state."""
+        wall = self.wall_time[state]
+        return 100.0 * self.cpu_time[state] / wall if wall > 0 else 0.0
+
+    def report(self):
+        return (f"📊 CPU active: {self.usage(AdaptiveRateController.ACTIVE):.1f}% "
+                f"({self.wall_time[AdaptiveRateController.ACTIVE]:.0f}s) | "
+                f"idle: {self.usage(AdaptiveRateController.IDLE):.1f}% "
+                f"({self.wall_time[AdaptiveRateController.IDLE]:.0f}s)")
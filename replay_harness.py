@@ -0,0 +1,178 @@
+# replay_harness.py
+"""
+Replays a recorded video through GestureRecognizer offline and reports how
+keyframe tracking trades accuracy for speed. The k=1 pass (full detection on
+every frame) is the reference the other passes are compared against.
+
+    python replay_harness.py recording.mp4 --k 1 2 3 5 8
+    python replay_harness.py recording.mp4 --backends solutions tasks --realtime
+
+--backends compares hand detection backends on the same video instead:
+how long each holds the calling thread per frame, how many results it
+delivers per second and how old a result is when it arrives.
+
+Any frame source spec works as input (video file, dir:PATH, synthetic).
+Sources that never end (cameras, synthetic) need --max-frames.
+"""
+import argparse
+import time
+import numpy as np
+
+from frame_sources import create_frame_source
+from gesture_recognizer import GestureRecognizer
+from landmark_utils import landmarks_to_array, save_trace
+
+
+def iter_video_frames(path, max_frames=None, realtime=False):
+    """Yield (timestamp, BGR frame) from a frame source spec"""
+    source = create_frame_source(path, realtime=realtime)
+    if not source.is_opened():
+        raise IOError(f"Could not open source: {path}")
+    if max_frames is None and source.endless:
+        source.release()
+        raise ValueError(f"Source {path} never ends; give max_frames")
+    fps = getattr(source, 'fps', 0) or 30.0
+    count = 0
+    try:
+        while max_frames is None or count < max_frames:
+            success, frame = source.read()
+            if not success:
+                break
+            yield count / fps, frame
+            count += 1
+    finally:
+        source.release()
+
+
+def replay(path, keyframe_interval=1, max_frames=None):
+    """
+    Run one pass over the video. Returns per-frame landmark arrays (None when
+    no hand), gestures and handedness, plus timing of the recognizer calls.
+    """
+    recognizer = GestureRecognizer(keyframe_interval=keyframe_interval)
+    run = {'timestamps': [], 'landmarks': [], 'gestures': [], 'hand_types': [], 'frame_shape': None}
+    processing_time = 0.0
+
+    for timestamp, frame in iter_video_frames(path, max_frames):
+        run['frame_shape'] = frame.shape
+        start = time.perf_counter()
+        _, landmarks, hand_type = recognizer.find_hand_landmarks(frame)
+        gesture, _ = recognizer.get_gesture()
+        processing_time += time.perf_counter() - start
+
+        run['timestamps'].append(timestamp)
+        run['landmarks'].append(landmarks_to_array(landmarks) if landmarks else None)
+        run['gestures'].append(gesture)
+        run['hand_types'].append(hand_type)
+
+    frames = len(run['gestures'])
+    run['frames'] = frames
+    run['detections'] = recognizer.detection_count
+    run['ms_per_frame'] = 1000 * processing_time / frames if frames else 0.0
+    return run
+
+
+def replay_backend(path, backend, max_frames=None, realtime=False):
+    """
+    Feed the video through one detection backend. realtime paces frames at
+    the video's FPS like a camera would; otherwise frames go in as fast as
+    the backend accepts them.
+    """
+    recognizer = GestureRecognizer(keyframe_interval=1, backend=backend)
+    frames, with_hand = 0, 0
+    blocked_time = 0.0
+    start = time.perf_counter()
+    for _, frame in iter_video_frames(path, max_frames, realtime):
+        call_start = time.perf_counter()
+        _, landmarks, _ = recognizer.find_hand_landmarks(frame)
+        blocked_time += time.perf_counter() - call_start
+        frames += 1
+        with_hand += landmarks is not None
+    # Closing waits for results still in flight
+    recognizer.close()
+    elapsed = time.perf_counter() - start
+    stats = recognizer.detector.stats()
+    stats.update({
+        'frames': frames,
+        'blocked_ms_per_frame': 1000 * blocked_time / frames if frames else 0.0,
+        'results_per_s': stats['completed'] / elapsed if elapsed > 0 else 0.0,
+        'hand_frames': with_hand / frames if frames else 0.0,
+    })
+    return stats
+
+
+def compare_to_reference(reference, run):
+    """Landmark error (pixels) and gesture agreement of run against reference"""
+    height, width = reference['frame_shape'][:2]
+    errors = []
+    for ref_lm, run_lm in zip(reference['landmarks'], run['landmarks']):
+        if ref_lm is not None and run_lm is not None:
+            delta = (ref_lm[:, :2] - run_lm[:, :2]) * (width, height)
+            errors.append(np.linalg.norm(delta, axis=1).mean())
+
+    matches = sum(a == b for a, b in zip(reference['gestures'], run['gestures']))
+    presence = sum((a is None) == (b is None) for a, b in zip(reference['landmarks'], run['landmarks']))
+    frames = max(reference['frames'], 1)
+    return {
+        'landmark_error_mean': float(np.mean(errors)) if errors else 0.0,
+        'landmark_error_p95': float(np.percentile(errors, 95)) if errors else 0.0,
+        'gesture_accuracy': matches / frames,
+        'presence_agreement': presence / frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recording and compare keyframe intervals")
+    parser.add_argument("video", help="Recorded video file")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 2, 3, 5, 8],
+                        help="Keyframe intervals to evaluate (1 = detect every frame)")
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--save-trace", metavar="PATH",
+                        help="Save the reference landmarks as a .npz trace")
+    parser.add_argument("--backends", nargs="+", metavar="NAME",
+                        help="Compare hand detection backends (solutions, tasks) instead of keyframe intervals")
+    parser.add_argument("--realtime", action="store_true",
+                        help="With --backends: feed frames at the video's FPS instead of as fast as possible")
+    args = parser.parse_args()
+
+    if args.max_frames is None:
+        source = create_frame_source(args.video)
+        endless = source.endless
+        source.release()
+        if endless:
+            parser.error(f"{args.video} never ends; give --max-frames")
+
+    if args.backends:
+        print(f"{'backend':<10} | {'frames':>6} | {'blocked ms':>10} | {'results/s':>9} | {'dropped':>7} | "
+              f"{'lat mean':>8} | {'lat p95':>8} | {'hand':>5}")
+        for backend in args.backends:
+            stats = replay_backend(args.video, backend, args.max_frames, args.realtime)
+            print(f"{backend:<10} | {stats['frames']:>6} | {stats['blocked_ms_per_frame']:>10.2f} | "
+                  f"{stats['results_per_s']:>9.1f} | {stats['dropped']:>7} | {stats['latency_ms_mean']:>6.1f}ms | "
+                  f"{stats['latency_ms_p95']:>6.1f}ms | {100 * stats['hand_frames']:>4.0f}%")
+        return
+
+    print("Running reference pass (k=1)...")
+    reference = replay(args.video, 1, args.max_frames)
+    if args.save_trace:
+        save_trace(args.save_trace, reference['timestamps'], reference['landmarks'], reference['hand_types'])
+        print(f"Trace saved to {args.save_trace}")
+    runs = {1: reference}
+    for k in args.k:
+        if k not in runs:
+            print(f"Running k={k}...")
+            runs[k] = replay(args.video, k, args.max_frames)
+
+    print(f"\n{reference['frames']} frames")
+    print(f"{'k':>3} | {'ms/frame':>8} | {'detect %':>8} | {'lm err px':>9} | {'p95 px':>7} | {'gesture acc':>11} | {'presence':>8}")
+    for k in sorted(runs):
+        run = runs[k]
+        stats = compare_to_reference(reference, run)
+        detect_pct = 100 * run['detections'] / max(run['frames'], 1)
+        print(f"{k:>3} | {run['ms_per_frame']:>8.2f} | {detect_pct:>7.1f}% | "
+              f"{stats['landmark_error_mean']:>9.2f} | {stats['landmark_error_p95']:>7.2f} | "
+              f"{100 * stats['gesture_accuracy']:>10.1f}% | {100 * stats['presence_agreement']:>7.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# scroll_engine.py
+import math
+import threading
+import time
+
+import config
+
+
+class ScrollEngine:
+    """
+    Turns fractional scroll deltas from the gesture logic into a steady
+    stream of integer scroll events for a sink (ComputerController.scroll).
+
+    Deltas are accumulated as floats so nothing is lost to truncation; only
+    whole units are sent and the remainder carries over. In threaded mode a
+    background thread drains the accumulator at SCROLL_RATE_HZ, spreading
+    each frame's movement over SCROLL_SMOOTHING seconds, and optionally
+    keeps scrolling with decaying momentum after release(). Without a
+    thread (offline replay) whole units are sent as soon as they add up.
+    """
+
+    def __init__(self, sink, threaded=True, rate_hz=None, momentum=None):
+        self.sink = sink
+        self.threaded = threaded
+        self.rate_hz = rate_hz or config.SCROLL_RATE_HZ
+        self.momentum = config.use_scroll_momentum if momentum is None else momentum
+
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.pending = 0.0       # Accumulated units not yet sent
+        self.velocity = 0.0      # Units per second while the finger moves
+        self.last_add_time = None
+        self.coasting = False
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.threaded and not self.running:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, name="scroll", daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+
+    def add(self, delta, now=None):
+        """Queue delta units (positive = scroll up)"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.coasting = False
+            self.pending += delta
+            if self.last_add_time is not None and now > self.last_add_time:
+                instant = delta / (now - self.last_add_time)
+                self.velocity = 0.5 * self.velocity + 0.5 * instant
+            self.last_add_time = now
+        if self.threaded:
+            self.wake.set()
+        else:
+            self._emit(self._take_whole())
+
+    def hold(self):
+        """Finger is back on the surface: stop any momentum"""
+        with self.lock:
+            self.coasting = False
+            self.velocity = 0.0
+            self.last_add_time = None
+
+    def release(self):
+        """Scroll gesture ended: coast with the last velocity if momentum is on"""
+        with self.lock:
+            self.last_add_time = None
+            self.coasting = (self.threaded and self.momentum and
+                             abs(self.velocity) > config.SCROLL_MOMENTUM_MIN_SPEED)
+            if not self.coasting:
+                self.velocity = 0.0
+        self.wake.set()
+
+    def halt(self):
+        """Drop everything still queued (e.g. when the pointer gets locked)"""
+        with self.lock:
+            self.pending = 0.0
+        self.hold()
+
+    def _take_whole(self):
+        with self.lock:
+            amount = int(self.pending)  # Truncates toward zero, remainder carries over
+            self.pending -= amount
+            return amount
+
+    def _emit(self, amount):
+        if amount:
+            self.sink(amount)
+
+    def _run(self):
+        period = 1.0 / self.rate_hz
+        last = time.monotonic()
+        while self.running:
+            with self.lock:
+                idle = not self.coasting and abs(self.pending) < 1.0
+            if idle:
+                self.wake.wait(0.5)
+                self.wake.clear()
+                last = time.monotonic()
+                continue
+
+            time.sleep(period)
+            now = time.monotonic()
+            dt = now - last
+            last = now
+            with self.lock:
+                if self.coasting:
+                    self.pending += self.velocity * dt
+                    self.velocity *= math.exp(-dt / config.SCROLL_MOMENTUM_DECAY)
+                    if abs(self.velocity) < config.SCROLL_MOMENTUM_MIN_SPEED:
+                        self.coasting = False
+                        self.velocity = 0.0
+                # Send a share of the backlog each tick instead of all of it at once
+                share = self.pending * min(1.0, dt / config.SCROLL_SMOOTHING)
+                if abs(share) < 1.0 <= abs(self.pending):
+                    share = math.copysign(1.0, self.pending)
+                amount = int(share)
+                self.pending -= amount
+            self._emit(amount)
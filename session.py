@@ -0,0 +1,287 @@
+# session.py
+"""
+Independent control sessions. A Session bundles one capture source with its
+own GestureRecognizer, pointer filter and controller sink, running the same
+stage pipeline as main.py. SessionSupervisor runs several sessions at once,
+each in its own process pinned to its own share of the cores, and
+aggregates their stats.
+
+    python session.py 0 file:monitor.mp4 --sinks os record --display
+    python session.py --benchmark recording.mp4 --max-n 4
+
+Only one session should use the "os" sink: they would all drive the same
+mouse. Extra sessions use "record", which only counts the actions.
+"""
+import argparse
+import os
+import queue
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+import config
+from metrics import metrics
+from pipeline import Pipeline, STOPPED, mp_context
+from pipeline_stages import PipelineContext, RenderStage, WINDOW_NAME, build_stages
+
+LATENCY_WINDOW = 1000  # Recent latencies a session keeps; the mean uses running totals
+RECORDED_ACTIONS = 100  # Recent actions a "record" sink keeps; totals are counted separately
+
+
+class SessionStatsStage:
+    """Headless replacement for the render stage: only measures what arrives"""
+
+    def __init__(self, shared):
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.count = 0
+        self.latency_sum = 0.0
+        self.first_time = self.last_time = None
+
+    def process(self, item):
+        result, _ = item
+        now = time.time()
+        latency = now - result.capture_time
+        self.latencies.append(latency)
+        self.count += 1
+        self.latency_sum += latency
+        self.first_time = self.first_time or now
+        self.last_time = now
+        return None
+
+    def latency_mean(self):
+        return self.latency_sum / self.count if self.count else 0.0
+
+    def fps(self):
+        """Steady-state rate, excluding model start-up before the first result"""
+        if not self.first_time or self.last_time <= self.first_time:
+            return None
+        return (self.count - 1) / (self.last_time - self.first_time)
+
+
+class Session:
+    """One source -> recognizer -> filter -> controller chain"""
+
+    def __init__(self, name, source, sink="record", display=False, realtime=True, adaptive_rate=True):
+        self.name = name
+        self.source = source
+        self.sink = sink
+        self.display = display
+        self.realtime = realtime
+        self.adaptive_rate = adaptive_rate
+
+    def _stages(self):
+        # Sessions already run in their own process, so their stages stay in it
+        stage_config = {name: dict(options, placement="thread" if options['placement'] == "process" else options['placement'])
+                        for name, options in config.PIPELINE_STAGES.items()}
+        # Recorded sources read as fast as possible must not lose frames
+        drop_policy = config.PIPELINE_DROP_POLICY if self.realtime else "block"
+        screen_size = None if self.sink == "os" else (1920, 1080)
+        return build_stages(
+            stage_config, drop_policy,
+            factories={'render': RenderStage if self.display else SessionStatsStage},
+            stage_args={
+                'capture': (self.source, self.realtime),
+                'filter': (screen_size,),
+                'act': (self.sink, RECORDED_ACTIONS),
+                'render': (f"{WINDOW_NAME} - {self.name}",) if self.display else (),
+            })
+
+    def run(self, stop_event=None, max_seconds=None):
+        """Run until the source ends, stop_event is set or max_seconds pass. Returns stats."""
+        pipeline = Pipeline(self._stages(), PipelineContext(self.adaptive_rate))
+        start, cpu_start = time.perf_counter(), time.process_time()
+        pipeline.start()
+        try:
+            while pipeline.step(0.05) != STOPPED:
+                if stop_event is not None and stop_event.is_set():
+                    break
+                if max_seconds is not None and time.perf_counter() - start > max_seconds:
+                    break
+                if self.display and cv2.waitKey(1) & 0xFF == ord('q'):
+                    break
+        finally:
+            pipeline.stop()
+            if self.display:
+                cv2.destroyAllWindows()
+        elapsed = time.perf_counter() - start
+
+        stage_stats = pipeline.stats()
+        render = pipeline.main_worker.objects[0] if pipeline.main_worker else None
+        frames = stage_stats['render']['items']
+        fps = render.fps() if isinstance(render, SessionStatsStage) else None
+        if fps is None:
+            fps = frames / elapsed if elapsed > 0 else 0.0
+        latency = render.latency_mean() if isinstance(render, SessionStatsStage) else 0.0
+        act = pipeline.stage_object('act')
+        actions = dict(act.action_counts()) if act is not None else {}
+        return {
+            'name': self.name,
+            'source': str(self.source),
+            'pid': os.getpid(),
+            'cores': sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else [],
+            'frames': frames,
+            'elapsed': elapsed,
+            'fps': fps,
+            'cpu': (time.process_time() - cpu_start) / elapsed if elapsed > 0 else 0.0,
+            'latency_ms_mean': 1000 * latency,
+            'actions': actions,
+            'stages': stage_stats,
+            'metrics': metrics.snapshot(),
+        }
+
+
+def core_sets(cores, count):
+    """
+    Split cores into count non-overlapping, contiguous sets (one per
+    session). With more sessions than cores there is nothing to split, so
+    None is returned and the sessions are not pinned.
+    """
+    if not cores or count > len(cores):
+        return None
+    size, extra = divmod(len(cores), count)
+    sets, start = [], 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(set(cores[start:end]))
+        start = end
+    return sets
+
+
+def _run_session(session, cores, stop_event, results, max_seconds):
+    if cores and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cores)
+    try:
+        results.put(session.run(stop_event, max_seconds))
+    except Exception as e:
+        results.put({'name': session.name, 'source': str(session.source), 'error': str(e)})
+
+
+class SessionSupervisor:
+    """Runs sessions in separate processes, each pinned to its own set of the usable cores"""
+
+    def __init__(self, sessions, pin=True):
+        self.sessions = sessions
+        self.pin = pin and hasattr(os, "sched_setaffinity")
+        self.stop_event = mp_context.Event()
+
+    def run(self, max_seconds=None):
+        """Start every session, wait for all of them and return their stats"""
+        sets = core_sets(sorted(os.sched_getaffinity(0)), len(self.sessions)) if self.pin else None
+        if self.pin and sets is None:
+            print("More sessions than cores: not pinning")
+        results = mp_context.Queue()
+        processes = []
+        for i, session in enumerate(self.sessions):
+            cores = sets[i] if sets else None
+            process = mp_context.Process(target=_run_session, name=f"session-{session.name}",
+                                  args=(session, cores, self.stop_event, results, max_seconds), daemon=True)
+            process.start()
+            processes.append(process)
+
+        collected = []
+        try:
+            # Read results before joining: a child can't exit while its result is unread
+            while len(collected) < len(processes):
+                try:
+                    collected.append(results.get(timeout=0.5))
+                except queue.Empty:
+                    if not any(p.is_alive() for p in processes):
+                        break
+        except KeyboardInterrupt:
+            print("Stopping sessions...")
+            self.stop_event.set()
+            while len(collected) < len(processes):
+                try:
+                    collected.append(results.get(timeout=5.0))
+                except queue.Empty:
+                    break
+        for process in processes:
+            process.join(timeout=2.0)
+            if process.is_alive():
+                process.terminate()
+        return collected
+
+    @staticmethod
+    def aggregate(results):
+        """Totals over all sessions; counters from each process's metrics are summed"""
+        ok = [r for r in results if 'error' not in r]
+        counters = {}
+        actions = {}
+        for r in ok:
+            for name, value in r['metrics'].items():
+                if name.endswith("_total") or "_total{" in name:
+                    counters[name] = counters.get(name, 0) + value
+            for name, value in r['actions'].items():
+                actions[name] = actions.get(name, 0) + value
+        return {
+            'sessions': len(results),
+            'failed': len(results) - len(ok),
+            'frames': sum(r['frames'] for r in ok),
+            'fps': sum(r['fps'] for r in ok),
+            'cpu': sum(r['cpu'] for r in ok),
+            'latency_ms_mean': float(np.mean([r['latency_ms_mean'] for r in ok])) if ok else 0.0,
+            'actions': actions,
+            'counters': counters,
+        }
+
+
+def print_results(results):
+    print(f"{'session':<12} | {'source':<24} | {'cores':<8} | {'frames':>6} | {'fps':>6} | {'cpu':>5} | {'latency':>8} | {'actions':>7}")
+    for r in results:
+        if 'error' in r:
+            print(f"{r['name']:<12} | {r['source']:<24} | failed: {r['error']}")
+            continue
+        cores = ",".join(str(c) for c in r['cores'])
+        print(f"{r['name']:<12} | {r['source'][-24:]:<24} | {cores[:8]:<8} | {r['frames']:>6} | {r['fps']:>6.1f} | "
+              f"{100 * r['cpu']:>4.0f}% | {r['latency_ms_mean']:>6.1f}ms | {sum(r['actions'].values()):>7}")
+    total = SessionSupervisor.aggregate(results)
+    print(f"{'total':<12} | {'':<24} | {'':<8} | {total['frames']:>6} | {total['fps']:>6.1f} | "
+          f"{100 * total['cpu']:>4.0f}% | {total['latency_ms_mean']:>6.1f}ms | {sum(total['actions'].values()):>7}")
+    if total['actions']:
+        print("Actions: " + ", ".join(f"{name}={count}" for name, count in sorted(total['actions'].items())))
+
+
+def benchmark(video, max_n, pin=True, max_seconds=None):
+    """Run 1..max_n concurrent sessions on the same video, as fast as they go"""
+    rows = []
+    for n in range(1, max_n + 1):
+        sessions = [Session(f"s{i}", video, sink="record", realtime=False, adaptive_rate=False) for i in range(n)]
+        total = SessionSupervisor.aggregate(SessionSupervisor(sessions, pin).run(max_seconds))
+        rows.append((n, total))
+        print(f"n={n}: {total['fps']:.1f} FPS total")
+
+    single = rows[0][1]['fps'] or 1e-9
+    print(f"\n{'n':>3} | {'total fps':>9} | {'fps/session':>11} | {'scaling':>7} | {'cpu':>6} | {'latency':>8}")
+    for n, total in rows:
+        print(f"{n:>3} | {total['fps']:>9.1f} | {total['fps'] / n:>11.1f} | {total['fps'] / (n * single):>6.0%} | "
+              f"{100 * total['cpu']:>5.0f}% | {total['latency_ms_mean']:>6.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run several gesture control sessions in parallel")
+    parser.add_argument("sources", nargs="*", help="Frame source specs, one session each")
+    parser.add_argument("--sinks", nargs="+", default=["record"],
+                        help="Controller sink per session (os, record); the last one repeats")
+    parser.add_argument("--display", action="store_true", help="Show a window per session")
+    parser.add_argument("--no-pin", action="store_true", help="Don't pin sessions to cores")
+    parser.add_argument("--max-seconds", type=float, default=None)
+    parser.add_argument("--benchmark", metavar="VIDEO", help="Measure scaling with 1..--max-n copies of VIDEO")
+    parser.add_argument("--max-n", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(args.benchmark, args.max_n, not args.no_pin, args.max_seconds)
+        return
+    if not args.sources:
+        parser.error("give at least one source or --benchmark")
+    sessions = []
+    for i, source in enumerate(args.sources):
+        sink = args.sinks[min(i, len(args.sinks) - 1)]
+        sessions.append(Session(f"session{i}", source, sink=sink, display=args.display))
+    print_results(SessionSupervisor(sessions, not args.no_pin).run(args.max_seconds))
+
+
+if __name__ == "__main__":
+    main()
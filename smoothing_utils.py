@@ -1,5 +1,8 @@
 # smoothing_utils.py
 import numpy as np
+from collections import deque
+
+import config
 
 def moving_average_filter(buffer, new_value):
     """Apply moving average smoothing"""
@@ -50,4 +53,35 @@ def adaptive_smoothing_factor(velocity, base_factor, threshold):
         return max(0.1, base_factor * 0.5)
     else:
         # Hand is moving - use normal smoothing
-        return base_factor
\ No newline at end of file
+        return base_factor
+
+
+class PointerFilter:
+    """
+    Holds the state of the full cursor smoothing chain (moving average ->
+    Kalman -> adaptive exponential smoothing -> deadzone) for one pointer.
+    """
+
+    def __init__(self):
+        self.position_buffer_x = deque(maxlen=config.position_buffer_size)
+        self.position_buffer_y = deque(maxlen=config.position_buffer_size)
+        self.kalman_x, self.kalman_y = 0, 0
+        self.kalman_p_x, self.kalman_p_y = 1, 1
+        self.prev_x, self.prev_y = 0, 0
+        self.velocity = 0
+
+    def update(self, screen_x, screen_y):
+        """Filter a raw screen position and return the smoothed cursor position"""
+        screen_x = moving_average_filter(self.position_buffer_x, screen_x)
+        screen_y = moving_average_filter(self.position_buffer_y, screen_y)
+        if config.use_kalman_filter:
+            self.kalman_x, self.kalman_p_x = kalman_filter(self.kalman_x, self.kalman_p_x, screen_x, config.kalman_measurement_variance, config.kalman_process_variance)
+            self.kalman_y, self.kalman_p_y = kalman_filter(self.kalman_y, self.kalman_p_y, screen_y, config.kalman_measurement_variance, config.kalman_process_variance)
+            screen_x, screen_y = self.kalman_x, self.kalman_y
+        self.velocity = np.sqrt((screen_x - self.prev_x)**2 + (screen_y - self.prev_y)**2)
+        current_smoothing = adaptive_smoothing_factor(self.velocity, config.smoothing_factor, config.velocity_threshold_for_adaptive) if config.use_adaptive_smoothing else config.smoothing_factor
+        current_x = self.prev_x + (screen_x - self.prev_x) * current_smoothing
+        current_y = self.prev_y + (screen_y - self.prev_y) * current_smoothing
+        current_x, current_y = apply_deadzone(current_x, current_y, self.prev_x, self.prev_y, config.DEADZONE_PIXELS)
+        self.prev_x, self.prev_y = current_x, current_y
+        return current_x, current_y